@@ -0,0 +1,137 @@
+# Native collection builtins against the equivalent interpreted Gemstone loops.
+# Usage: python benchmarks/bench_collections.py [items]
+import sys
+
+from common import run_gem, report
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+SETUP = f"""
+mem items = []
+mem i = 0
+while i < {N} do
+    push(items, {{"life": Random(-50, 255), "x": i}})
+    mem i = i + 1
+end
+def alive(p) return p.life > 0 end
+def life(p) return p.life end
+"""
+
+CASES = [
+    ("map", """
+mem out = []
+for p in items do push(out, life(p)) end
+""", "mem out = map(items, life)"),
+    ("filter", """
+mem out = []
+for p in items do
+    if alive(p) then push(out, p) end
+end
+""", "mem out = filter(items, alive)"),
+    ("retain (gemlogic rebuild)", """
+mem active = []
+for p in items do
+    if p.life > 0 then push(active, p) end
+end
+mem items = active
+""", "retain(items, alive)"),
+    ("reverse", """
+mem out = []
+mem i = len(items) - 1
+while i > 0 - 1 do
+    push(out, items[i])
+    mem i = i - 1
+end
+""", "reverse(items)"),
+    ("slice", """
+mem out = []
+mem i = 100
+while i < len(items) - 100 do
+    push(out, items[i])
+    mem i = i + 1
+end
+""", "mem out = slice(items, 100, len(items) - 100)"),
+    ("index_of", """
+mem found = 0 - 1
+mem i = 0
+mem target = items[len(items) - 1]
+while i < len(items) do
+    if found < 0 then
+        if items[i] == target then mem found = i end
+    end
+    mem i = i + 1
+end
+""", "mem found = index_of(items, items[len(items) - 1])"),
+]
+
+# Interpreted sort: insertion sort is all that is practical in Gemstone today,
+# so it runs on a small prefix and is reported per element.
+SORT_N = min(N, 1_000)
+INTERPRETED_SORT = f"""
+mem arr = map(slice(items, 0, {SORT_N}), life)
+mem i = 1
+while i < len(arr) do
+    mem key = arr[i]
+    mem j = i - 1
+    mem moving = 1
+    while moving do
+        if j < 0 then mem moving = 0 else
+            if arr[j] > key then
+                mem arr[j + 1] = arr[j]
+                mem j = j - 1
+            else mem moving = 0 end
+        end
+    end
+    mem arr[j + 1] = key
+    mem i = i + 1
+end
+"""
+NATIVE_SORT = f"mem arr = slice(items, 0, {SORT_N})\nsort(arr, life)"
+
+MEMBERSHIP = """
+mem hits = 0
+mem i = 0
+while i < 2000 do
+    if has(pool, i * 7) then mem hits = hits + 1 end
+    mem i = i + 1
+end
+"""
+
+QUEUE = """
+mem i = 0
+while i < {n} do
+    push(q, i)
+    mem i = i + 1
+end
+while len(q) > 0 do pop_front(q) end
+"""
+
+def bench(setup, src):
+    interp, _ = run_gem(setup)
+    _, seconds = run_gem(src, interp)
+    return seconds
+
+def main():
+    print(f"{N} particles")
+    for name, interpreted, native in CASES:
+        slow = bench(SETUP, interpreted)
+        fast = bench(SETUP, native)
+        report(f"{name}: interpreted", slow)
+        report(f"{name}: native", fast, slow)
+    slow = bench(SETUP, INTERPRETED_SORT)
+    fast = bench(SETUP, NATIVE_SORT)
+    report(f"sort {SORT_N}: interpreted insertion", slow)
+    report(f"sort {SORT_N}: native", fast, slow)
+
+    pool = f"mem i = 0\nmem pool = []\nwhile i < {N} do push(pool, i) mem i = i + 1 end\n"
+    slow = bench(pool, MEMBERSHIP)
+    fast = bench(pool + "mem pool = Set(pool)\n", MEMBERSHIP)
+    report("has: list", slow)
+    report("has: Set", fast, slow)
+    slow = bench("mem q = []\n", QUEUE.format(n=N * 5))
+    fast = bench("mem q = Deque()\n", QUEUE.format(n=N * 5))
+    report("pop_front: list", slow)
+    report("pop_front: Deque", fast, slow)
+
+if __name__ == '__main__':
+    main()
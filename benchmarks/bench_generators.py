@@ -0,0 +1,61 @@
+# Peak memory of a squares -> filter -> sum pipeline built from generator
+# functions versus the same pipeline built from intermediate lists. The
+# generator version should stay flat as the input grows.
+# Usage: python benchmarks/bench_generators.py [largest size]
+# (e.g. 10000000 for a 10M-element run; expect several minutes)
+import sys
+import tracemalloc
+
+from common import run_gem
+
+LARGEST = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+
+PRELUDE = """
+def is_even(x) return x - Floor(x / 2) * 2 == 0 end
+"""
+
+LISTS = PRELUDE + """
+def squares(n)
+    mem out = []
+    mem i = 0
+    while i < n do
+        push(out, i * i)
+        mem i = i + 1
+    end
+    return out
+end
+mem total = 0
+for v in filter(squares({n}), is_even) do mem total = total + v end
+"""
+
+GENERATORS = PRELUDE + """
+def squares(n)
+    mem i = 0
+    while i < n do
+        yield i * i
+        mem i = i + 1
+    end
+end
+mem total = 0
+for v in filter(squares({n}), is_even) do mem total = total + v end
+"""
+
+def measure(template, n):
+    tracemalloc.start()
+    interpreter, seconds = run_gem(template.format(n=n))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return interpreter.global_symbol_table.get("total"), seconds, peak
+
+def main():
+    sizes = [LARGEST // 100, LARGEST // 10, LARGEST]
+    print(f"{'elements':>12} {'lists peak':>14} {'generators peak':>16} {'lists':>10} {'generators':>11}")
+    for n in sizes:
+        list_total, list_time, list_peak = measure(LISTS, n)
+        gen_total, gen_time, gen_peak = measure(GENERATORS, n)
+        assert list_total == gen_total
+        print(f"{n:>12,} {list_peak / 1024:>11,.0f} KiB {gen_peak / 1024:>12,.0f} KiB "
+              f"{list_time:>9.2f}s {gen_time:>10.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Time-to-first-instruction for a large generated program, started from
+# source and from a snapshot image.
+# Usage: python benchmarks/bench_image.py [functions]
+import os
+import sys
+import tempfile
+
+from common import new_interpreter, parse, run_gem, timed, report
+from interpreter.snapshot import save_image, load_image
+
+FUNCTIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+def generate(n):
+    parts = []
+    for i in range(n):
+        parts.append(f"""
+def step_{i}(x, y)
+    mem t = x * {i % 7 + 1} + y
+    if t > {i} then
+        return t - {i}
+    else
+        return [t, {{"id": {i}, "name": "step_{i}"}}]
+    end
+end
+""")
+    parts.append(f"""
+mem table = []
+mem i = 0
+while i < {n * 10} do
+    push(table, {{"key": i, "value": i * 3, "tags": [i, i + 1]}})
+    mem i = i + 1
+end
+""")
+    return "".join(parts)
+
+def start_from_source(src):
+    interp, _ = run_gem(src)
+    return interp
+
+def start_from_image(path):
+    interp = new_interpreter()
+    load_image(interp, path)
+    return interp
+
+def main():
+    src = generate(FUNCTIONS)
+    print(f"program: {FUNCTIONS} functions, {len(src) / 1e6:.1f} MB of source")
+    _, parse_s = timed(parse, src)
+    interp, source_s = timed(start_from_source, src)
+    path = os.path.join(tempfile.mkdtemp(prefix="gem_bench_image_"), "program.gemimg")
+    _, save_s = timed(save_image, interp, path)
+    restored, image_s = timed(start_from_image, path)
+    for name in ("step_0", f"step_{FUNCTIONS - 1}", "table"):
+        assert restored.global_symbol_table.get(name) is not None
+    report("lex + parse only", parse_s)
+    report("start from source", source_s)
+    report("start from image", image_s, source_s)
+    print(f"image: {os.path.getsize(path) / 1e6:.1f} MB, saved in {save_s * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
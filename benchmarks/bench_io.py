@@ -0,0 +1,47 @@
+# Compares the streaming file-handle builtins against ReadFile/WriteFile.
+# Usage: python benchmarks/bench_io.py [lines]
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from common import run_gem, report
+
+LINES = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+WRITES = min(LINES, 2_000)
+
+def measure(src):
+    tracemalloc.start()
+    interpreter, seconds = run_gem(src)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return interpreter, seconds, peak
+
+def main():
+    tmp = tempfile.mkdtemp(prefix="gem_bench_io_")
+    path = os.path.join(tmp, "input.log").replace("\\", "/")
+    with open(path, "w") as f:
+        for i in range(LINES):
+            f.write(f"2026-01-01 12:00:00 INFO request {i} served in {i % 97} ms\n")
+    print(f"input: {LINES} lines, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    slurp = f'mem text = ReadFile("{path}")\n'
+    stream = f'mem n = 0\nfor line in Lines("{path}") do\n  mem n = n + len(line)\nend\n'
+    _, slurp_s, slurp_peak = measure(slurp)
+    _, stream_s, stream_peak = measure(stream)
+    report("ReadFile (whole file)", slurp_s)
+    report("Lines (streaming)", stream_s)
+    print(f"peak memory: ReadFile {slurp_peak / 1e6:.1f} MB, Lines {stream_peak / 1e6:.2f} MB")
+
+    out = os.path.join(tmp, "out.log").replace("\\", "/")
+    rewrite = (f'mem log = ""\nmem i = 0\nwhile i < {WRITES} do\n'
+               f'  mem log = log + "line "\n  WriteFile("{out}", log)\n  mem i = i + 1\nend\n')
+    buffered = (f'mem h = Open("{out}", "w")\nmem i = 0\nwhile i < {WRITES} do\n'
+                f'  Write(h, "line ")\n  mem i = i + 1\nend\nClose(h)\n')
+    _, rewrite_s = run_gem(rewrite)
+    _, buffered_s = run_gem(buffered)
+    report(f"WriteFile x{WRITES} (rewrite)", rewrite_s)
+    report(f"Write x{WRITES} (buffered handle)", buffered_s, rewrite_s)
+
+if __name__ == '__main__':
+    main()
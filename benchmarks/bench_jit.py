@@ -0,0 +1,115 @@
+# Numeric kernels with and without the loop JIT.
+# Usage: python benchmarks/bench_jit.py [scale]
+import sys
+
+from common import new_interpreter, run_gem, report
+from interpreter.jit import TracingJit
+
+SCALE = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+KERNELS = {
+    "integer sum": f"""
+mem i = 0
+mem result = 0
+while i < {SCALE} do
+    mem result = result + i * i
+    mem i = i + 1
+end
+""",
+    "leibniz pi": f"""
+mem k = 0
+mem sign = 1.0
+mem result = 0.0
+while k < {SCALE} do
+    mem result = result + sign * 4.0 / (2 * k + 1)
+    mem sign = 0.0 - sign
+    mem k = k + 1
+end
+""",
+    "collatz steps": f"""
+mem n = 1
+mem result = 0
+while n < {SCALE // 50} do
+    mem x = n
+    while x > 1 do
+        if x - Floor(x / 2) * 2 == 0 then mem x = x / 2 else mem x = 3 * x + 1 end
+        mem result = result + 1
+    end
+    mem n = n + 1
+end
+""",
+    "list dot product": f"""
+mem a = []
+mem b = []
+mem i = 0
+while i < {SCALE // 4} do
+    push(a, i)
+    push(b, {SCALE // 4} - i)
+    mem i = i + 1
+end
+mem result = 0
+mem j = 0
+while j < len(a) do
+    mem result = result + a[j] * b[j]
+    mem j = j + 1
+end
+""",
+    "for-in prefix sums": f"""
+mem xs = []
+mem i = 0
+while i < {SCALE // 4} do push(xs, i) mem i = i + 1 end
+mem result = 0
+for x in xs do
+    mem result = result + x
+    mem xs[x] = result
+end
+""",
+    # Generators and map/filter stages run interpreted code on every step, so
+    # they must see the compiled loop's latest variables, including on the
+    # first step of a nested for and after a variable returns to its old value.
+    "generators and lazy stages": f"""
+def count(n)
+    mem k = 0
+    while k < n do
+        yield k * step
+        mem k = k + 1
+    end
+end
+def odd(x) return x - Floor(x / 2) * 2 == 1 end
+def shift(x) return x + flag end
+mem step = 1
+mem gens = []
+mem i = 0
+while i < {SCALE // 100} do push(gens, count(3)) mem i = i + 1 end
+mem result = 0
+mem i = 0
+while i < len(gens) do
+    mem step = i
+    for v in gens[i] do mem result = result + v end
+    mem i = i + 1
+end
+mem step = 1
+mem flag = 0
+for v in map(filter(count({SCALE // 4}), odd), shift) do
+    mem result = result + v
+    mem flag = 1 - flag
+end
+mem result = result + flag * 7
+""",
+}
+
+def main():
+    for name, src in KERNELS.items():
+        plain, plain_s = run_gem(src)
+        jitted = new_interpreter()
+        jitted.jit = TracingJit()
+        jitted, jit_s = run_gem(src, jitted)
+        expected = plain.global_symbol_table.get("result")
+        got = jitted.global_symbol_table.get("result")
+        assert expected == got, f"{name}: {expected} != {got}"
+        report(f"{name}: interpreter", plain_s)
+        report(f"{name}: jit", jit_s, plain_s)
+    print(jitted.jit.format_report())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Sampling a large file: MapFile only touches the pages it reads, while
+# ReadFile reads and decodes the whole file into a string first (ReadBytes
+# reads it without decoding). Loading and scanning are timed separately, since
+# the interpreted scan loop costs the same for every variant and would hide
+# the difference between them. MapFile's scan also pays for faulting in the
+# pages it touches.
+# Usage: python benchmarks/bench_mmap.py [file MB] [stride bytes]
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from common import run_gem, report
+
+FILE_MB = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+STRIDE = int(sys.argv[2]) if len(sys.argv) > 2 else 64 * 1024
+
+LOAD = """
+mem data = {load}
+mem n = len(data)
+"""
+
+SCAN = """
+mem hits = 0
+mem off = 0
+while off < n do
+    if data[off] == {nine} then mem hits = hits + 1 end
+    mem off = off + {stride}
+end
+"""
+
+VARIANTS = {
+    "ReadFile (text)": ("ReadFile", '"9"'),
+    "ReadBytes": ("ReadBytes", "57"),
+    "MapFile": ("MapFile", "57"),
+}
+
+def write_file(path):
+    # Fixed-width decimal lines, so every sampled byte is an ASCII digit.
+    chunk = "".join(f"{i:09d}\n" for i in range(100_000)).encode()
+    remaining = FILE_MB * 1024 * 1024
+    with open(path, "wb") as f:
+        while remaining > 0:
+            f.write(chunk[:remaining])
+            remaining -= len(chunk)
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(prefix="gem_bench_mmap_"), "data.txt")
+    write_file(path)
+    print(f"{FILE_MB} MB file, sampling every {STRIDE} bytes")
+    try:
+        load_baseline = scan_baseline = None
+        results = set()
+        for label, (loader, nine) in VARIANTS.items():
+            tracemalloc.start()
+            interpreter, load_seconds = run_gem(LOAD.format(load=f'{loader}("{path}")'))
+            interpreter, scan_seconds = run_gem(SCAN.format(nine=nine, stride=STRIDE), interpreter)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.add(interpreter.global_symbol_table.get("hits"))
+            del interpreter
+            print(f"\n{label} (peak {peak / 1024 / 1024:,.1f} MB):")
+            report("load", load_seconds, load_baseline)
+            report("scan", scan_seconds, scan_baseline)
+            load_baseline = load_baseline or load_seconds
+            scan_baseline = scan_baseline or scan_seconds
+        assert len(results) == 1
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Loading a program split into modules that all import one shared library:
+# cold (every module parsed), warm (parsed modules reused from the
+# process-wide cache by a fresh interpreter), and the old single-file style
+# where the library text is pasted into every module.
+# Usage: python benchmarks/bench_modules.py [modules] [library functions]
+import os
+import sys
+import tempfile
+
+from common import new_interpreter, run_gem, timed, report
+from interpreter import modules
+from interpreter.modules import ModuleLoader
+
+MODULES = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+FUNCTIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+def library():
+    return "\n".join(f"def f{i}(a, b) return a * {i} + b - (a + {i}) / (b + 1) end" for i in range(FUNCTIONS))
+
+def write_tree(root):
+    with open(os.path.join(root, "shared.gem"), "w") as f: f.write(library())
+    lines = []
+    for m in range(MODULES):
+        with open(os.path.join(root, f"part{m}.gem"), "w") as f:
+            f.write(f'import "shared.gem"\ndef run{m}(x) return shared.f{m % FUNCTIONS}(x, {m}) end\n')
+        lines.append(f'import "part{m}.gem"\nmem total = total + part{m}.run{m}(2)')
+    main = os.path.join(root, "main.gem")
+    with open(main, "w") as f: f.write("mem total = 0\n" + "\n".join(lines) + "\n")
+    return main
+
+def load(main):
+    interpreter = new_interpreter()
+    interpreter.modules = ModuleLoader(interpreter, main_path=main)
+    with open(main) as f: run_gem(f.read(), interpreter)
+    return interpreter
+
+def pasted():
+    # Each part carries its own copy of the library, as before imports existed.
+    text = "mem total = 0\n" + "\n".join(f"{library()}\nmem total = total + f{m % FUNCTIONS}(2, {m})" for m in range(MODULES))
+    return run_gem(text)[0]
+
+def main():
+    main_path = write_tree(tempfile.mkdtemp(prefix="gem_bench_modules_"))
+    print(f"{MODULES} modules importing a {FUNCTIONS}-function library")
+    modules.parse_cache.clear()
+    cold, cold_time = timed(load, main_path)
+    warm, warm_time = timed(load, main_path)
+    flat, flat_time = timed(pasted)
+    assert cold.global_symbol_table.get("total") == warm.global_symbol_table.get("total") == flat.global_symbol_table.get("total")
+    report("library pasted into every module", flat_time)
+    report("imports, cold parse cache", cold_time, flat_time)
+    report("imports, warm parse cache", warm_time, flat_time)
+    print()
+    print(cold.modules.format_report())
+
+if __name__ == "__main__":
+    main()
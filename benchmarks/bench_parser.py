@@ -0,0 +1,108 @@
+# Parse throughput of the table-driven Pratt parser versus the classic
+# recursive-descent Parser, after checking both build identical ASTs for a
+# corpus of random programs (and fail on the same malformed ones).
+# Usage: python benchmarks/bench_parser.py [statements] [seed]
+import gc
+import os
+import random
+import sys
+
+from common import tokenize, timed, report
+from lexer.lexer import Token
+from parser.parser import Parser
+from parser.pratt import PrattParser
+
+STATEMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000
+SEED = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+REPEATS = 5
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+BINARY_OPS = ["+", "-", "*", "/", "==", "!=", "<", ">", "<=", ">="]
+NAMES = ["x", "y", "total", "items", "point", "speed"]
+
+def gen_expr(rng, depth):
+    if depth <= 0 or rng.random() < 0.15:
+        choice = rng.randrange(4)
+        if choice == 0: return str(rng.randrange(1000))
+        if choice == 1: return f"{rng.randrange(100)}.{rng.randrange(100)}"
+        if choice == 2: return '"s"'
+        return rng.choice(NAMES)
+    choice = rng.randrange(10)
+    if choice < 5: return f"{gen_expr(rng, depth - 1)} {rng.choice(BINARY_OPS)} {gen_expr(rng, depth - 1)}"
+    if choice == 5: return f"{rng.choice('+-')}{gen_expr(rng, depth - 1)}"
+    if choice == 6: return f"({gen_expr(rng, depth - 1)})"
+    if choice == 7:
+        args = ", ".join(gen_expr(rng, depth - 2) for _ in range(rng.randrange(3)))
+        return f"{rng.choice(NAMES)}({args})"
+    if choice == 8:
+        if rng.random() < 0.3: return f"{rng.choice(NAMES)}[{gen_expr(rng, depth - 2)}:{rng.choice(['', gen_expr(rng, depth - 2)])}]"
+        return f"{rng.choice(NAMES)}[{gen_expr(rng, depth - 1)}].{rng.choice(NAMES)}"
+    if rng.random() < 0.5: return f"[{gen_expr(rng, depth - 2)}, {gen_expr(rng, depth - 2)}]"
+    return f'{{"k": {gen_expr(rng, depth - 2)}}}'
+
+def gen_statement(rng, depth=6):
+    choice = rng.randrange(8)
+    if choice < 3: return f"mem {rng.choice(NAMES)} = {gen_expr(rng, depth)}"
+    if choice == 3: return f"emit {gen_expr(rng, depth)}"
+    if choice == 4: return f"if {gen_expr(rng, depth)} then {gen_statement(rng, depth - 2)} else {gen_statement(rng, depth - 2)} end"
+    if choice == 5: return f"while {gen_expr(rng, depth)} do {gen_statement(rng, depth - 2)} end"
+    if choice == 6: return f"for {rng.choice(NAMES)} in {gen_expr(rng, depth - 2)} do {gen_statement(rng, depth - 2)} end"
+    if rng.random() < 0.5: return f"def g(a) {gen_statement(rng, depth - 2)} yield {gen_expr(rng, depth - 2)} end"
+    return f"def f(a, b) {gen_statement(rng, depth - 2)} return {gen_expr(rng, depth - 2)} end"
+
+def gen_program(rng, count, depth=6):
+    return "\n".join(gen_statement(rng, depth) for _ in range(count))
+
+def dump(node):
+    # Structural form of an AST, including the line numbers tokens carry.
+    if isinstance(node, Token): return (node.type, node.value, node.line)
+    if isinstance(node, (list, tuple)): return [dump(item) for item in node]
+    if hasattr(node, '__dict__'): return (type(node).__name__, {key: dump(value) for key, value in vars(node).items()})
+    return node
+
+def parse_with(parser_class, tokens):
+    try: return dump(parser_class(tokens).parse())
+    except Exception as e: return ("error", str(e))
+
+def differential(rng):
+    sources = [open(os.path.join(ROOT, name)).read() for name in ("gemlogic.gem", os.path.join("benchmarks", "particles.gem"))]
+    sources += [gen_program(rng, 20) for _ in range(300)]
+    # Drop a token from some programs so error paths are compared as well.
+    broken = []
+    for text in sources[2:150]:
+        words = text.split(" ")
+        del words[rng.randrange(len(words))]
+        broken.append(" ".join(words))
+    mismatches = 0
+    for text in sources + broken:
+        try: tokens = tokenize(text)
+        except Exception: continue
+        if parse_with(Parser, tokens) != parse_with(PrattParser, tokens):
+            mismatches += 1
+            if mismatches == 1: print(f"first mismatch:\n{text}\n")
+    print(f"differential: {len(sources) + len(broken)} programs, {mismatches} mismatches")
+    return mismatches
+
+def best_of(func):
+    # Parsing allocates heavily, so a garbage collection landing in one
+    # parser's run would skew the comparison; take the fastest of several
+    # runs with the collector off.
+    gc.disable()
+    try: return min(timed(func)[1] for _ in range(REPEATS))
+    finally: gc.enable()
+
+def main():
+    rng = random.Random(SEED)
+    if differential(rng): sys.exit(1)
+    for label, depth in (("typical", 6), ("deep", 12)):
+        text = gen_program(rng, STATEMENTS, depth)
+        tokens = tokenize(text)
+        print(f"\n{label}: {STATEMENTS} statements, {len(tokens):,} tokens, best of {REPEATS}")
+        classic = best_of(lambda: Parser(tokens).parse())
+        pratt = best_of(lambda: PrattParser(tokens).parse())
+        report("classic recursive descent", classic)
+        report("pratt", pratt, classic)
+        print(f"{'':<40} {len(tokens) / pratt / 1e6:10.2f} M tokens/s")
+
+if __name__ == "__main__":
+    main()
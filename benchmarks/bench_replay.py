@@ -0,0 +1,45 @@
+# Replays a committed input trace through particles.gem so every run does the
+# same frame-by-frame work, then compares interpreter configurations.
+# Usage: python bench_replay.py [trace]
+import os
+import subprocess
+import sys
+import time
+
+from common import SRC_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TRACE = sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, "traces", "particles.input")
+SCRIPT = os.path.join(HERE, "particles.gem")
+
+CONFIGS = [
+    ("interpreter", []),
+    ("interpreter --jit", ["--jit"]),
+    ("framebuffer backend", ["--backend", "framebuffer"]),
+]
+
+def run(extra):
+    cmd = [sys.executable, os.path.join(SRC_DIR, "main.py"), "--replay", TRACE, *extra, SCRIPT]
+    env = dict(os.environ, DISPLAY="")
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    elapsed = time.perf_counter() - start
+    lines = [line for line in result.stdout.splitlines() if line and not line.startswith(("!!", "Press"))]
+    return elapsed, lines
+
+def main():
+    reference = None
+    for label, extra in CONFIGS:
+        elapsed, lines = run(extra)
+        if "Error" in " ".join(lines):
+            print(f"{label:<24} skipped: {lines[-1]}")
+            continue
+        frames, checksum = int(lines[-2]), int(lines[-1])
+        if reference is None: reference = (frames, checksum)
+        status = "identical workload" if (frames, checksum) == reference else f"MISMATCH {frames}/{checksum}"
+        print(f"{label:<24} {elapsed * 1000 / frames:7.2f} ms/frame over {frames} frames  ({status})")
+        for line in lines[:-2]:
+            if line.startswith("Rendered"): print(f"{'':<24} {line}")
+
+if __name__ == '__main__':
+    main()
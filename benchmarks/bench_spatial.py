@@ -0,0 +1,60 @@
+# Query throughput of the Grid builtins from 1k to 100k entities, with an
+# interpreted brute-force scan as the baseline for the smaller sizes.
+# Usage: python benchmarks/bench_spatial.py [queries]
+import random
+import sys
+
+from common import new_interpreter, run_gem, report
+
+QUERIES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+SIZES = [1_000, 10_000, 100_000]
+WORLD = 4_000
+
+GRID_QUERIES = f"""
+mem i = 0
+mem found = 0
+while i < {QUERIES} do
+    mem q = queries[i]
+    mem found = found + len(GridQueryRadius(grid, q.x, q.y, 50))
+    mem i = i + 1
+end
+"""
+
+BRUTE_QUERIES = f"""
+mem i = 0
+mem found = 0
+while i < {{n}} do
+    mem q = queries[i]
+    for e in entities do
+        mem dx = e.x - q.x
+        mem dy = e.y - q.y
+        if dx * dx + dy * dy < 2501 then mem found = found + 1 end
+    end
+    mem i = i + 1
+end
+"""
+
+def setup(n):
+    rng = random.Random(n)
+    interp = new_interpreter()
+    table = interp.global_symbol_table
+    table.set("entities", [{"x": rng.uniform(0, WORLD), "y": rng.uniform(0, WORLD)} for _ in range(n)])
+    table.set("queries", [{"x": rng.uniform(0, WORLD), "y": rng.uniform(0, WORLD)} for _ in range(QUERIES)])
+    run_gem("mem grid = Grid(64)\nfor e in entities do GridInsert(grid, e) end\n", interp)
+    return interp
+
+def main():
+    for n in SIZES:
+        interp = setup(n)
+        _, grid_s = run_gem(GRID_QUERIES, interp)
+        found = interp.global_symbol_table.get("found")
+        report(f"{n} entities: Grid ({QUERIES / grid_s:,.0f} q/s)", grid_s)
+        if n <= 10_000:
+            brute_n = max(1, QUERIES * 1_000 // n // 10)
+            _, brute_s = run_gem(BRUTE_QUERIES.format(n=brute_n), interp)
+            brute_s = brute_s * QUERIES / brute_n
+            report(f"{n} entities: brute force (scaled)", brute_s)
+            print(f"  Grid speedup x{brute_s / grid_s:.1f}, {found / QUERIES:.1f} hits/query")
+
+if __name__ == '__main__':
+    main()
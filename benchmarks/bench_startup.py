@@ -0,0 +1,63 @@
+# Startup cost of a non-graphical script with the lazy stdlib registry versus
+# importing every stdlib module up front (the old behaviour).
+# Usage: python benchmarks/bench_startup.py [runs]
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from common import SRC_DIR
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+DRIVER = """
+import sys
+sys.path.insert(0, {src!r})
+from interpreter.interpreter import Interpreter
+from interpreter.stdlib import load_stdlib
+from lexer.lexer import Lexer, TOK_EOF
+from parser.parser import Parser
+interpreter = Interpreter()
+load_stdlib(interpreter.global_symbol_table, eager={eager})
+lexer = Lexer(open({script!r}).read())
+tokens = [lexer.get_next_token()]
+while tokens[-1].type != TOK_EOF: tokens.append(lexer.get_next_token())
+for node in Parser(tokens).parse(): interpreter.visit(node)
+"""
+
+SCRIPT = """
+mem total = 0
+for x in [1, 2, 3, 4, 5] do mem total = total + Floor(x * 1.5) end
+"""
+
+def import_time_us(driver):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", driver],
+                            capture_output=True, text=True, check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        # Only top-level entries, whose cumulative time already covers children.
+        parts = line.split("|")
+        if line.startswith("import time:") and len(parts) == 3 and not parts[2].startswith("  "):
+            if parts[1].strip().isdigit(): total += int(parts[1])
+    return total, "tkinter" in result.stderr
+
+def wall_time_ms(driver):
+    samples = []
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, "-c", f"import time; t = time.perf_counter()\n{driver}\nprint(time.perf_counter() - t)"],
+                                capture_output=True, text=True, check=True)
+        samples.append(float(result.stdout.split()[-1]) * 1000)
+    return statistics.median(samples)
+
+def main():
+    script = os.path.join(tempfile.mkdtemp(prefix="gem_bench_startup_"), "compute.gem")
+    with open(script, "w") as f: f.write(SCRIPT)
+    for label, eager in (("eager (all modules)", True), ("lazy registry", False)):
+        driver = DRIVER.format(src=SRC_DIR, eager=eager, script=script)
+        imports_us, loaded_tk = import_time_us(driver)
+        wall = wall_time_ms(driver)
+        print(f"{label:<22} imports {imports_us / 1000:7.2f} ms   startup+run {wall:7.2f} ms   tkinter loaded: {loaded_tk}")
+
+if __name__ == '__main__':
+    main()
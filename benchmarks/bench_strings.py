@@ -0,0 +1,42 @@
+# Builds a large string from many 10-byte fragments with `+` and with Builder.
+# `+` copies the whole string on every step, so it is run on a smaller count.
+# Usage: python benchmarks/bench_strings.py [fragments]
+import sys
+
+from common import run_gem, report
+
+FRAGMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+CONCAT_FRAGMENTS = min(FRAGMENTS, 50_000)
+
+CONCAT = """
+mem s = ""
+mem i = 0
+while i < {n} do
+    mem s = s + "0123456789"
+    mem i = i + 1
+end
+"""
+
+BUILDER = """
+mem sb = Builder()
+mem i = 0
+while i < {n} do
+    Append(sb, "0123456789")
+    mem i = i + 1
+end
+mem s = ToString(sb)
+"""
+
+def main():
+    interp, concat_s = run_gem(CONCAT.format(n=CONCAT_FRAGMENTS))
+    assert len(interp.global_symbol_table.get("s")) == CONCAT_FRAGMENTS * 10
+    interp, builder_s = run_gem(BUILDER.format(n=FRAGMENTS))
+    assert len(interp.global_symbol_table.get("s")) == FRAGMENTS * 10
+    report(f"'+' x{CONCAT_FRAGMENTS}", concat_s)
+    report(f"Builder x{FRAGMENTS}", builder_s)
+    concat_rate = CONCAT_FRAGMENTS / concat_s
+    builder_rate = FRAGMENTS / builder_s
+    print(f"fragments/s: '+' {concat_rate:,.0f}, Builder {builder_rate:,.0f} (x{builder_rate / concat_rate:.2f})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# File I/O from spawned tasks versus the same jobs run one after another.
+# "latency" adds a sleep per job standing in for a slow disk or network
+# round trip, which tasks overlap; "disk" is plain ReadFile/WriteFile, where
+# page-cached reads are CPU-bound and only gain with spare cores.
+# Usage: python benchmarks/bench_tasks.py [jobs] [file MB]
+import os
+import sys
+import tempfile
+
+from common import run_gem, report
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+FILE_MB = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+LATENCY = 0.02
+
+def job(directory, latency):
+    wait = f"sleep({latency})" if latency else ""
+    return f"""
+def job(i)
+    {wait}
+    mem text = ReadFile("{directory}/in" + ToString(i) + ".txt")
+    WriteFile("{directory}/out" + ToString(i) + ".txt", text)
+    return len(text)
+end
+"""
+
+def sequential(directory, latency):
+    return job(directory, latency) + f"""
+mem total = 0
+mem i = 0
+while i < {JOBS} do
+    mem total = total + job(i)
+    mem i = i + 1
+end
+"""
+
+def concurrent(directory, latency):
+    return job(directory, latency) + f"""
+mem tasks = []
+mem i = 0
+while i < {JOBS} do
+    push(tasks, spawn(job, i))
+    mem i = i + 1
+end
+mem total = 0
+for t in tasks do mem total = total + await(t) end
+"""
+
+def main():
+    directory = tempfile.mkdtemp(prefix="gem_bench_tasks_")
+    line = "x" * 1023 + "\n"
+    for i in range(JOBS):
+        with open(os.path.join(directory, f"in{i}.txt"), "w") as f: f.write(line * (FILE_MB * 1024))
+    print(f"{JOBS} jobs, {FILE_MB} MB each")
+    run_gem("sleep(0)")  # load the scheduler (and asyncio) outside the timings
+    for label, latency in (("disk", 0), (f"latency {LATENCY * 1000:.0f} ms", LATENCY)):
+        seq, seq_time = run_gem(sequential(directory, latency))
+        con, con_time = run_gem(concurrent(directory, latency))
+        assert seq.global_symbol_table.get("total") == con.global_symbol_table.get("total") == JOBS * FILE_MB * 1024 * 1024
+        print(f"\n{label}:")
+        report("sequential", seq_time)
+        report("spawned tasks", con_time, seq_time)
+
+if __name__ == "__main__":
+    main()
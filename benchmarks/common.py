@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+if SRC_DIR not in sys.path: sys.path.insert(0, SRC_DIR)
+
+from lexer.lexer import Lexer, TOK_EOF
+from parser.pratt import PrattParser
+from interpreter.interpreter import Interpreter
+from interpreter.stdlib import load_stdlib
+
+def tokenize(text):
+    lexer = Lexer(text)
+    tokens = []
+    token = lexer.get_next_token()
+    while token.type != TOK_EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    tokens.append(token)
+    return tokens
+
+def parse(text):
+    return PrattParser(tokenize(text)).parse()
+
+def new_interpreter():
+    interpreter = Interpreter()
+    load_stdlib(interpreter.global_symbol_table)
+    return interpreter
+
+def run_gem(text, interpreter=None):
+    interpreter = interpreter or new_interpreter()
+    nodes = parse(text)
+    start = time.perf_counter()
+    for node in nodes:
+        interpreter.visit(node)
+    return interpreter, time.perf_counter() - start
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def report(label, seconds, baseline=None):
+    line = f"{label:<40} {seconds * 1000:10.2f} ms"
+    if baseline: line += f"   x{baseline / seconds:.2f}"
+    print(line)
@@ -20,12 +20,47 @@ class SymbolTable:
         del self.symbols[name]
 
 class Function:
-    def __init__(self, name, body_nodes, arg_names):
+    def __init__(self, name, body_nodes, arg_names, globals_table=None, generator=False):
         self.name = name
         self.body_nodes = body_nodes
         self.arg_names = arg_names
+        # Top-level table of the module the function was defined in; calls
+        # resolve free names there rather than in the caller's module.
+        self.globals_table = globals_table
+        self.generator = generator
     def __repr__(self): return f"<function {self.name}>"
 
+class GemGenerator:
+    # Returned by calling a def whose body yields. Each next() resumes the
+    # body in its own scope and runs it up to the following yield.
+    def __init__(self, interpreter, function, scope, globals_table):
+        self.interpreter = interpreter
+        self.function = function
+        self.scope = scope
+        self.globals_table = globals_table
+        self.frames = interpreter.generate(function.body_nodes)
+
+    def __iter__(self): return self
+
+    def __next__(self):
+        interpreter = self.interpreter
+        previous_scope, previous_module = interpreter.current_symbol_table, interpreter.module_table
+        interpreter.current_symbol_table, interpreter.module_table = self.scope, self.globals_table
+        try:
+            return next(self.frames)
+        finally:
+            interpreter.current_symbol_table, interpreter.module_table = previous_scope, previous_module
+
+    def __reduce__(self): raise Exception(f"Cannot snapshot {self}")
+    def __repr__(self): return f"<generator {self.function.name}>"
+
+class Module:
+    def __init__(self, name, path, symbol_table):
+        self.name = name
+        self.path = path
+        self.symbol_table = symbol_table
+    def __repr__(self): return f"<module {self.name}>"
+
 class ReturnValue:
     def __init__(self, value): self.value = value
 
@@ -33,6 +68,13 @@ class Interpreter:
     def __init__(self):
         self.global_symbol_table = SymbolTable()
         self.current_symbol_table = self.global_symbol_table
+        self.module_table = self.global_symbol_table
+        self.modules = None
+        self.module_path = []  # extra directories to search, from --path
+        self.main_path = None
+        self.scheduler = None
+        self.profiler = None
+        self.jit = None
 
     def visit(self, node):
         method_name = f'visit_{type(node).__name__}'
@@ -49,9 +91,11 @@ class Interpreter:
         return node.token.value
 
     def visit_ListNode(self, node):
+        if self.profiler: self.profiler.count('list', f"line {node.line}")
         return [self.visit(e) for e in node.element_nodes]
 
     def visit_DictNode(self, node):
+        if self.profiler: self.profiler.count('dict', f"line {node.line}")
         return {self.visit(k): self.visit(v) for k, v in node.key_value_pairs}
 
     def visit_BinOpNode(self, node):
@@ -92,6 +136,9 @@ class Interpreter:
             if isinstance(obj, dict):
                 obj[member] = value
                 return value
+            if isinstance(obj, Module):
+                obj.symbol_table.set(member, value)
+                return value
             raise Exception(f"Cannot assign to property '{member}' of non-dict")
 
         # 3. Index Assignment: mem arr[0] = 10
@@ -102,6 +149,10 @@ class Interpreter:
             if isinstance(lst, list):
                 lst[idx] = value
                 return value
+            set_item = getattr(lst, 'set_item', None)  # writable buffers
+            if set_item:
+                set_item(idx, value)
+                return value
             raise Exception(f"Cannot assign to index {idx} of non-list")
 
         raise Exception(f"Invalid assignment target: {node.target_node}")
@@ -118,11 +169,20 @@ class Interpreter:
         try: return left[index]
         except: raise Exception(f"Cannot access index {index} of {left}")
 
+    def visit_SliceNode(self, node):
+        start = self.visit(node.start_node) if node.start_node else None
+        end = self.visit(node.end_node) if node.end_node else None
+        return slice(start, end)
+
     def visit_MemberAccessNode(self, node):
         left = self.visit(node.left_node)
         member = node.member_name_token.value
         if isinstance(left, dict) and member in left:
             return left[member]
+        if isinstance(left, Module):
+            value = left.symbol_table.symbols.get(member)
+            if value is None: raise Exception(f"Module '{left.name}' has no member '{member}'")
+            return value
         raise Exception(f"Cannot access property '{member}' of {left}")
 
     def visit_EmitNode(self, node):
@@ -144,41 +204,113 @@ class Interpreter:
         return None
 
     def visit_WhileNode(self, node):
+        # countdown reaches 0 when the JIT wants to take over the loop; it
+        # stays negative (never fires) when no JIT is attached.
+        jit = self.jit
+        countdown = jit.countdown(node) if jit else -1
         while True:
+            if countdown == 0:
+                if jit.execute(self, node): return None
+                countdown = jit.countdown(node)
             condition = self.visit(node.condition_node)
             if not condition: break
             for stmt in node.body_nodes:
                 res = self.visit(stmt)
                 if isinstance(res, ReturnValue): return res
+            countdown -= 1
+        if countdown > 0: jit.cool(node, countdown)
         return None
 
     def visit_ForNode(self, node):
         iterator = self.visit(node.iterator_node)
         var_name = node.var_name_token.value
         
-        if not isinstance(iterator, list) and not isinstance(iterator, str):
-            raise Exception(f"Cannot iterate over {iterator}")
-            
         # Create a new scope for the loop? 
         # For simplicity, we use current scope, but careful not to leak too much if not desired.
-        for item in iterator:
-            self.current_symbol_table.set(var_name, item)
-            for stmt in node.body_nodes:
-                res = self.visit(stmt)
-                if isinstance(res, ReturnValue): return res
-        return None
+        it = self.iterate(iterator)
+        try:
+            jit = self.jit
+            countdown = jit.countdown(node) if jit else -1
+            if countdown == 0:
+                if jit.execute(self, node, it): return None
+                countdown = jit.countdown(node)
+            for item in it:
+                self.current_symbol_table.set(var_name, item)
+                for stmt in node.body_nodes:
+                    res = self.visit(stmt)
+                    if isinstance(res, ReturnValue): return res
+                countdown -= 1
+                if countdown == 0:
+                    if jit.execute(self, node, it): return None
+                    countdown = jit.countdown(node)
+            if countdown > 0: jit.cool(node, countdown)
+            return None
+        finally:
+            self.release(it)
+
+    def release(self, it):
+        # Iterators that own a resource (Lines(path)) free it when the loop
+        # ends, including early exits through return or an error.
+        release = getattr(it, 'release', None)
+        if release: release()
+
+    def iterate(self, iterator):
+        # Any native iterable (sets, deques, Lines, generators, ...) works;
+        # iterators are consumed lazily, one item per pass.
+        if isinstance(iterator, dict) or not hasattr(iterator, '__iter__'):
+            raise Exception(f"Cannot iterate over {iterator}")
+        return iter(iterator)
+
+    def generate(self, nodes):
+        # Statement executor for generator bodies. It suspends at yield
+        # statements, so it handles the control flow that contains one; any
+        # other statement is visited as usual. Returns True on 'return'.
+        for node in nodes:
+            kind = type(node)
+            if kind is YieldNode:
+                yield self.visit(node.node_to_yield)
+            elif kind is ReturnNode:
+                self.visit(node.node_to_return)
+                return True
+            elif kind is IfNode and node.has_yield:
+                for condition, statement_list in node.cases:
+                    if self.visit(condition):
+                        if (yield from self.generate(statement_list)): return True
+                        break
+                else:
+                    if node.else_case and (yield from self.generate(node.else_case)): return True
+            elif kind is WhileNode and node.has_yield:
+                while self.visit(node.condition_node):
+                    if (yield from self.generate(node.body_nodes)): return True
+            elif kind is ForNode and node.has_yield:
+                var_name = node.var_name_token.value
+                it = self.iterate(self.visit(node.iterator_node))
+                try:
+                    for item in it:
+                        self.current_symbol_table.set(var_name, item)
+                        if (yield from self.generate(node.body_nodes)): return True
+                finally:
+                    self.release(it)
+            elif isinstance(self.visit(node), ReturnValue):
+                return True
+        return False
+
+    def visit_YieldNode(self, node):
+        raise Exception("'yield' can only be used as a statement inside a def")
 
     def visit_FuncDefNode(self, node):
         func_name = node.var_name_token.value
         arg_names = [arg.value for arg in node.arg_tokens]
-        func = Function(func_name, node.body_nodes, arg_names)
+        func = Function(func_name, node.body_nodes, arg_names, self.module_table, node.is_generator)
         self.current_symbol_table.set(func_name, func)
         return func
 
     def visit_FuncCallNode(self, node):
         function = self.visit(node.node_to_call)
         args = [self.visit(arg) for arg in node.arg_nodes]
+        return self.call_value(function, args)
 
+    def call_value(self, function, args):
         if isinstance(function, BuiltinFunction):
             return function.func(self, args)
 
@@ -190,11 +322,15 @@ class Interpreter:
         raise Exception(f"Not a function: {function}")
 
     def call_function(self, function, args):
-        new_scope = SymbolTable(parent=self.global_symbol_table)
+        if self.profiler: self.profiler.count('scope', f"call {function.name}")
+        globals_table = function.globals_table or self.global_symbol_table
+        new_scope = SymbolTable(parent=globals_table)
         for i in range(len(args)):
             new_scope.set(function.arg_names[i], args[i])
-        previous_scope = self.current_symbol_table
+        if function.generator: return GemGenerator(self, function, new_scope, globals_table)
+        previous_scope, previous_module = self.current_symbol_table, self.module_table
         self.current_symbol_table = new_scope
+        self.module_table = globals_table
         result = None
         try:
             for stmt in function.body_nodes:
@@ -204,8 +340,18 @@ class Interpreter:
                     break
         finally:
             self.current_symbol_table = previous_scope
+            self.module_table = previous_module
         return result
     
     def visit_ReturnNode(self, node):
         value = self.visit(node.node_to_return)
         return ReturnValue(value)
+
+    def visit_ImportNode(self, node):
+        if self.modules is None:
+            from .modules import ModuleLoader
+            self.modules = ModuleLoader(self, self.module_path, self.main_path)
+        module = self.modules.load(node.path_token.value)
+        name = node.alias_token.value if node.alias_token else module.name
+        self.current_symbol_table.set(name, module)
+        return None
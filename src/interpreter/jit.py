@@ -0,0 +1,381 @@
+import math
+from lexer.lexer import *
+from parser.nodes import *
+from .interpreter import GemGenerator
+from .stdlib import BuiltinFunction
+from .stdlib.binary import Buffer
+from .stdlib.core import LazyStage
+
+# Result codes returned by compiled loops.
+DONE = 0          # the loop ran to completion
+ENTRY_FAILED = 1  # an entry guard failed before anything ran
+
+ARITH_OPS = {TOK_PLUS: '+', TOK_MINUS: '-', TOK_MUL: '*', TOK_DIV: '/'}
+COMPARE_OPS = {TOK_EE: '==', TOK_NE: '!=', TOK_LT: '<', TOK_GT: '>', TOK_LTE: '<=', TOK_GTE: '>='}
+SPECIALISED_TYPES = (int, float, str, list, Buffer)
+NUMBER_TYPES = (int, float)
+# Type of x[i] for an int i; list items can be anything.
+ITEM_TYPES = {list: None, str: str, Buffer: int}
+MATH_FUNCTIONS = {"Floor": math.floor, "Sin": math.sin, "Cos": math.cos}
+# Result types of safe builtins, used to type expressions that call them.
+RESULT_TYPES = {
+    "len": int, "index_of": int, "has": int, "Random": int, "Floor": int,
+    "Sin": float, "Cos": float, "ToString": str,
+    "ReadU8": int, "ReadU16": int, "ReadU32": int, "ReadI32": int, "ReadF32": float, "ReadF64": float,
+}
+
+# Builtins that never re-enter the interpreter or switch tasks, so they can be
+# called from compiled code while variables live in Python locals.
+SAFE_BUILTINS = {
+    "len", "push", "pop", "print", "Random", "Sin", "Cos", "Floor",
+    "Append", "Join", "ToString", "slice", "index_of", "reverse", "has", "add",
+    "ReadU8", "ReadU16", "ReadU32", "ReadI32", "ReadF32", "ReadF64",
+}
+
+MAX_VARIANTS = 4
+MAX_FAILURES = 8
+
+class Unsupported(Exception): pass
+class NotReady(Exception): pass
+
+def index_helper(left, index):
+    try: return left[index]
+    except: raise Exception(f"Cannot access index {index} of {left}")
+
+def set_index_helper(lst, idx, value):
+    if isinstance(lst, list):
+        lst[idx] = value
+        return
+    if isinstance(lst, Buffer):
+        lst.set_item(idx, value)
+        return
+    raise Exception(f"Cannot assign to index {idx} of non-list")
+
+def iter_helper(iterator):
+    if isinstance(iterator, dict) or not hasattr(iterator, '__iter__'):
+        raise Exception(f"Cannot iterate over {iterator}")
+    return iterator
+
+def reentrant_helper(iterator):
+    # Generators and lazy map/filter stages run interpreted code on each
+    # step, which must see the loop's current variables.
+    return isinstance(iterator, (GemGenerator, LazyStage))
+
+class LoopCompiler:
+    # Turns a hot while/for loop into a Python function specialised on the
+    # types its variables had when the loop became hot. Variables that keep
+    # their type through every assignment in the loop get direct indexing and
+    # inlined builtins; the rest go through the generic helpers.
+    def __init__(self, node):
+        self.node = node
+        self.reads = []
+        self.writes = []
+        self.builtins = []
+        self.assignments = []
+        self.types = {}
+        self.lines = []
+        self.temps = 0
+
+    def use(self, names, name):
+        if name not in names: names.append(name)
+
+    def emit(self, depth, text):
+        self.lines.append("    " * depth + text)
+
+    def type_of(self, node):
+        # Type an expression always evaluates to under self.types, or None.
+        if isinstance(node, (NumberNode, StringNode)):
+            return type(node.token.value)
+        if isinstance(node, VarAccessNode):
+            return self.types.get(node.var_name_token.value)
+        if isinstance(node, BinOpNode):
+            left, right = self.type_of(node.left_node), self.type_of(node.right_node)
+            op = node.op_token.type
+            if op in COMPARE_OPS: return int
+            if left in NUMBER_TYPES and right in NUMBER_TYPES:
+                return float if op == TOK_DIV or float in (left, right) else int
+            if op == TOK_PLUS and left is str and right is str: return str
+            return None
+        if isinstance(node, UnaryOpNode):
+            operand = self.type_of(node.node)
+            return operand if operand in NUMBER_TYPES else None
+        if isinstance(node, IndexAccessNode):
+            if self.type_of(node.index_node) is not int: return None
+            return ITEM_TYPES.get(self.type_of(node.left_node))
+        if isinstance(node, FuncCallNode) and isinstance(node.node_to_call, VarAccessNode):
+            return RESULT_TYPES.get(node.node_to_call.var_name_token.value)
+        return None
+
+    def inline(self, name, arg_nodes, args):
+        # Python equivalents of builtins for argument types known up front.
+        types = [self.type_of(arg) for arg in arg_nodes]
+        if name == "len" and len(types) == 1 and types[0] in ITEM_TYPES: return f"len({args[0]})"
+        if name == "push" and len(types) == 2 and types[0] is list: return f"{args[0]}.append({args[1]})"
+        if name == "pop" and types == [list]: return f"{args[0]}.pop()"
+        if name in MATH_FUNCTIONS and len(types) == 1 and types[0] in NUMBER_TYPES: return f"_{name}({args[0]})"
+        return None
+
+    def expr(self, node):
+        if isinstance(node, (NumberNode, StringNode)):
+            return repr(node.token.value)
+        if isinstance(node, VarAccessNode):
+            self.use(self.reads, node.var_name_token.value)
+            return f"v_{node.var_name_token.value}"
+        if isinstance(node, BinOpNode):
+            left, right = self.expr(node.left_node), self.expr(node.right_node)
+            op = node.op_token.type
+            if op in ARITH_OPS: return f"({left} {ARITH_OPS[op]} {right})"
+            if op in COMPARE_OPS: return f"(1 if {left} {COMPARE_OPS[op]} {right} else 0)"
+            raise Unsupported(f"operator {op}")
+        if isinstance(node, UnaryOpNode):
+            operand = self.expr(node.node)
+            return f"(-{operand})" if node.op_token.type == TOK_MINUS else operand
+        if isinstance(node, IndexAccessNode):
+            left, index = self.expr(node.left_node), self.expr(node.index_node)
+            if self.type_of(node.index_node) is int:
+                left_type = self.type_of(node.left_node)
+                if left_type in (list, str): return f"{left}[{index}]"
+                if left_type is Buffer: return f"{left}.view[{index}]"
+            return f"_index({left}, {index})"
+        if isinstance(node, FuncCallNode):
+            callee = node.node_to_call
+            if not isinstance(callee, VarAccessNode) or callee.var_name_token.value not in SAFE_BUILTINS:
+                raise Unsupported(f"call to {callee}")
+            name = callee.var_name_token.value
+            # Inlined calls still rely on the entry guard that the name is
+            # bound to the real builtin.
+            self.use(self.builtins, name)
+            args = [self.expr(arg) for arg in node.arg_nodes]
+            return self.inline(name, node.arg_nodes, args) or f"b_{name}.func(interp, [{', '.join(args)}])"
+        raise Unsupported(type(node).__name__)
+
+    def condition(self, node):
+        # Comparisons used directly as conditions skip the 1/0 conversion.
+        if isinstance(node, BinOpNode) and node.op_token.type in COMPARE_OPS:
+            left, right = self.expr(node.left_node), self.expr(node.right_node)
+            return f"({left} {COMPARE_OPS[node.op_token.type]} {right})"
+        return self.expr(node)
+
+    def sync(self, depth, flag):
+        # Writes variables back before a re-entrant iterator takes its next
+        # step. o_ is moved along too, so the final write-back still sees a
+        # variable that later returns to its entry value as changed.
+        if not self.writes: return
+        self.emit(depth, f"if {flag}:")
+        for name in self.writes: self.emit(depth + 1, f"if v_{name} is not o_{name}: symbols[{name!r}] = o_{name} = v_{name}")
+
+    def block(self, nodes, depth):
+        if not nodes: self.emit(depth, "pass")
+        for node in nodes: self.statement(node, depth)
+
+    def statement(self, node, depth):
+        if isinstance(node, VarAssignNode):
+            target = node.target_node
+            value = self.expr(node.value_node)
+            if isinstance(target, VarAccessNode):
+                self.use(self.writes, target.var_name_token.value)
+                self.assignments.append((target.var_name_token.value, node.value_node, False))
+                self.emit(depth, f"v_{target.var_name_token.value} = {value}")
+            elif isinstance(target, IndexAccessNode):
+                self.temps += 1
+                self.emit(depth, f"t{self.temps} = {value}")
+                left, index = self.expr(target.left_node), self.expr(target.index_node)
+                if self.type_of(target.left_node) is list and self.type_of(target.index_node) is int:
+                    self.emit(depth, f"{left}[{index}] = t{self.temps}")
+                else:
+                    self.emit(depth, f"_set_index({left}, {index}, t{self.temps})")
+            else:
+                raise Unsupported("member assignment")
+        elif isinstance(node, IfNode):
+            keyword = "if"
+            for condition, body in node.cases:
+                self.emit(depth, f"{keyword} {self.condition(condition)}:")
+                self.block(body, depth + 1)
+                keyword = "elif"
+            if node.else_case:
+                self.emit(depth, "else:")
+                self.block(node.else_case, depth + 1)
+        elif isinstance(node, WhileNode):
+            self.emit(depth, f"while {self.condition(node.condition_node)}:")
+            self.block(node.body_nodes, depth + 1)
+        elif isinstance(node, ForNode):
+            var_name = node.var_name_token.value
+            self.use(self.writes, var_name)
+            self.assignments.append((var_name, node.iterator_node, True))
+            self.temps += 1
+            iterator, flag = f"t{self.temps}", f"r{self.temps}"
+            self.emit(depth, f"{iterator} = _iter({self.expr(node.iterator_node)})")
+            self.emit(depth, f"{flag} = _reentrant({iterator})")
+            # The first step runs on entering the for, so sync before it too.
+            self.sync(depth, flag)
+            self.emit(depth, f"for v_{var_name} in {iterator}:")
+            self.block(node.body_nodes, depth + 1)
+            self.sync(depth + 1, flag)
+        elif isinstance(node, EmitNode):
+            self.emit(depth, f"print({self.expr(node.node_to_print)})")
+        else:
+            self.emit(depth, self.expr(node))
+
+    def analyse(self):
+        # Generates the loop body once to learn which variables and builtins it
+        # touches; raises Unsupported for anything that cannot be compiled.
+        node = self.node
+        if isinstance(node, ForNode):
+            self.use(self.writes, node.var_name_token.value)
+            self.block(node.body_nodes, 2)
+        else:
+            self.condition(node.condition_node)
+            self.block(node.body_nodes, 2)
+        for name in self.builtins:
+            if name in self.writes: raise Unsupported(f"builtin '{name}' is reassigned in the loop")
+        self.lines = []
+        self.temps = 0
+
+    def stable_types(self, table, loop_var):
+        # Entry types of the variables that every assignment in the loop
+        # gives the same type again. Dropping one variable can make others
+        # unknown, so this repeats until nothing changes.
+        types = self.types = {}
+        for name in self.writes + self.reads:
+            value = table.get(name)
+            if name == loop_var or type(value) not in SPECIALISED_TYPES: continue
+            types[name] = type(value)
+        changed = True
+        while changed:
+            changed = False
+            for name, value_node, is_item in self.assignments:
+                if name not in types: continue
+                value_type = self.type_of(value_node)
+                if is_item: value_type = ITEM_TYPES.get(value_type)
+                if value_type is not types[name]:
+                    del types[name]
+                    changed = True
+        return types
+
+    def compile(self, table):
+        node = self.node
+        loop_var = node.var_name_token.value if isinstance(node, ForNode) else None
+        names = [n for n in self.writes if n not in self.reads] + self.reads
+        for name in names:
+            if name != loop_var and table.get(name) is None: raise NotReady(f"'{name}' is unbound")
+        types = self.stable_types(table, loop_var)
+        namespace = {"_index": index_helper, "_set_index": set_index_helper, "_iter": iter_helper, "_reentrant": reentrant_helper,
+                     "DONE": DONE, "ENTRY_FAILED": ENTRY_FAILED}
+        for name, func in MATH_FUNCTIONS.items(): namespace[f"_{name}"] = func
+        for name in self.builtins:
+            builtin = table.get(name)
+            if not isinstance(builtin, BuiltinFunction): raise NotReady(f"'{name}' is not a builtin")
+            namespace[f"b_{name}"] = builtin
+        for name, type_ in types.items(): namespace[f"T_{name}"] = type_
+
+        self.emit(0, "def trace(interp, table, symbols, it):")
+        for name in names: self.emit(1, f"v_{name} = o_{name} = table.get({name!r})")
+        entry_guards = [f"type(v_{name}) is T_{name}" for name in types]
+        entry_guards += [f"table.get({name!r}) is b_{name}" for name in self.builtins]
+        if entry_guards: self.emit(1, f"if not ({' and '.join(entry_guards)}): return ENTRY_FAILED")
+        self.emit(1, "try:")
+        if loop_var:
+            self.emit(2, "r0 = _reentrant(it)")
+            self.emit(2, f"for v_{loop_var} in it:")
+        else:
+            self.emit(2, f"while {self.condition(node.condition_node)}:")
+        self.block(node.body_nodes, 3)
+        if loop_var: self.sync(3, "r0")
+        self.emit(2, "return DONE")
+        # Direct indexing raises IndexError where the helpers give a message.
+        self.emit(1, "except IndexError as e:")
+        self.emit(2, f"raise Exception(f\"Index out of range in loop at line {node.line}: {{e}}\")")
+        self.emit(1, "finally:")
+        for name in self.writes: self.emit(2, f"if v_{name} is not o_{name}: symbols[{name!r}] = v_{name}")
+        if not self.writes: self.emit(2, "pass")
+
+        source = "\n".join(self.lines)
+        exec(compile(source, f"<jit line {node.line}>", "exec"), namespace)
+        return namespace["trace"]
+
+class LoopRecord:
+    def __init__(self, node, threshold):
+        self.node = node
+        self.kind = "for" if isinstance(node, ForNode) else "while"
+        self.warmup = threshold
+        self.compiler = None
+        self.variants = []
+        self.status = "cold"
+        self.entries = 0
+        self.entry_misses = 0
+        self.failures = 0
+
+class TracingJit:
+    # Loops count their iterations; once a loop passes the threshold its body
+    # is compiled into a Python function specialised on its variables' types,
+    # with one variant per combination of entry types seen.
+    def __init__(self, threshold=100):
+        self.threshold = threshold
+        self.records = {}
+
+    def record(self, node):
+        record = self.records.get(id(node))
+        if record is None:
+            record = self.records[id(node)] = LoopRecord(node, self.threshold)
+        return record
+
+    def countdown(self, node):
+        record = self.record(node)
+        if record.status == "disabled": return -1
+        return record.warmup
+
+    def cool(self, node, remaining):
+        self.record(node).warmup = remaining
+
+    def fail(self, record, reason, permanent=False):
+        record.failures += 1
+        record.reason = reason
+        if permanent or record.failures >= MAX_FAILURES:
+            record.status = "disabled"
+        record.warmup = self.threshold
+
+    def execute(self, interpreter, node, it=None):
+        record = self.record(node)
+        if record.compiler is None:
+            record.compiler = LoopCompiler(node)
+            try:
+                record.compiler.analyse()
+            except Unsupported as e:
+                self.fail(record, f"unsupported: {e}", permanent=True)
+                return False
+        table = interpreter.current_symbol_table
+        for trace in record.variants:
+            if trace(interpreter, table, table.symbols, it) == DONE: return self.finish(record)
+            record.entry_misses += 1
+        if len(record.variants) >= MAX_VARIANTS:
+            self.fail(record, "too many type variants", permanent=True)
+            return False
+        compiler = LoopCompiler(node)
+        compiler.analyse()
+        try:
+            trace = compiler.compile(table)
+        except NotReady as e:
+            self.fail(record, str(e))
+            return False
+        record.variants.append(trace)
+        record.status = "compiled"
+        if trace(interpreter, table, table.symbols, it) == ENTRY_FAILED:
+            self.fail(record, "entry guard failed right after compiling")
+            return False
+        return self.finish(record)
+
+    def finish(self, record):
+        # Later entries into this loop go straight to the compiled code.
+        record.entries += 1
+        record.warmup = 0
+        return True
+
+    def format_report(self):
+        lines = ["== JIT report ==",
+                 f"{'loop':<6} {'line':>5} {'status':<10} {'variants':>8} {'entries':>8} {'entry misses':>12}"]
+        for record in sorted(self.records.values(), key=lambda r: r.node.line or 0):
+            if record.status == "cold": continue
+            lines.append(f"{record.kind:<6} {str(record.node.line):>5} {record.status:<10} {len(record.variants):>8} "
+                         f"{record.entries:>8} {record.entry_misses:>12}")
+            if record.failures: lines.append(f"{'':<13}last failure: {record.reason}")
+        return "\n".join(lines)
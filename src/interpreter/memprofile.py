@@ -0,0 +1,93 @@
+import collections
+import json
+import tracemalloc
+
+class MemoryProfiler:
+    # Counts the values the interpreter allocates (by kind and by source
+    # site) and samples tracemalloc once per GameLoop frame.
+    def __init__(self, interpreter, leak_window=30):
+        self.interpreter = interpreter
+        self.leak_window = leak_window
+        self.kinds = collections.Counter()
+        self.sites = collections.Counter()
+        self.frames = []
+        self.frame_allocations = 0
+        self.container_sizes = collections.defaultdict(list)
+
+    def start(self):
+        if not tracemalloc.is_tracing(): tracemalloc.start()
+
+    def stop(self):
+        if tracemalloc.is_tracing(): tracemalloc.stop()
+
+    def count(self, kind, site):
+        self.kinds[kind] += 1
+        self.sites[(kind, site)] += 1
+        self.frame_allocations += 1
+
+    def begin_frame(self):
+        self.frame_allocations = 0
+        if tracemalloc.is_tracing(): tracemalloc.reset_peak()
+
+    def end_frame(self):
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        self.frames.append({"allocations": self.frame_allocations, "current": current, "peak": peak})
+        frame = len(self.frames)
+        for name, value in self.interpreter.global_symbol_table.symbols.items():
+            if isinstance(value, (list, dict, set, collections.deque)):
+                self.container_sizes[name].append((frame, len(value)))
+
+    def leaks(self):
+        # A global container is suspicious when it grew on almost every one of
+        # the last leak_window frames and never shrank back.
+        suspects = []
+        for name, samples in self.container_sizes.items():
+            recent = [size for _, size in samples[-self.leak_window:]]
+            if len(recent) < self.leak_window: continue
+            grew = sum(1 for a, b in zip(recent, recent[1:]) if b > a)
+            shrank = sum(1 for a, b in zip(recent, recent[1:]) if b < a)
+            if grew >= (len(recent) - 1) * 0.9 and not shrank:
+                suspects.append({"name": name, "size": recent[-1], "growth_per_frame": (recent[-1] - recent[0]) / (len(recent) - 1)})
+        recent = [f["current"] for f in self.frames[-self.leak_window:]]
+        if len(recent) >= self.leak_window and all(b >= a for a, b in zip(recent, recent[1:])) and recent[-1] > recent[0]:
+            suspects.append({"name": "<heap>", "size": recent[-1], "growth_per_frame": (recent[-1] - recent[0]) / (len(recent) - 1)})
+        return suspects
+
+    def summary(self):
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        frame_peaks = [f["peak"] for f in self.frames]
+        return {
+            "allocations": dict(self.kinds),
+            "sites": [{"kind": kind, "site": site, "count": n} for (kind, site), n in self.sites.most_common()],
+            "heap": {"current": current, "peak": peak},
+            "frames": {
+                "count": len(self.frames),
+                "max_peak": max(frame_peaks, default=0),
+                "mean_peak": sum(frame_peaks) / len(frame_peaks) if frame_peaks else 0,
+                "mean_allocations": sum(f["allocations"] for f in self.frames) / len(self.frames) if self.frames else 0,
+                "samples": self.frames,
+            },
+            "leaks": self.leaks(),
+        }
+
+    def write_json(self, path, summary=None):
+        with open(path, 'w') as f: json.dump(summary or self.summary(), f, indent=2)
+
+    def format_table(self, summary=None, top=15):
+        summary = summary or self.summary()
+        lines = ["== Memory report ==", f"{'kind':<10} {'count':>12}"]
+        for kind, n in sorted(summary["allocations"].items(), key=lambda kv: -kv[1]):
+            lines.append(f"{kind:<10} {n:>12,}")
+        lines.append("")
+        lines.append(f"{'kind':<10} {'site':<32} {'count':>12}")
+        for entry in summary["sites"][:top]:
+            lines.append(f"{entry['kind']:<10} {entry['site']:<32} {entry['count']:>12,}")
+        heap, frames = summary["heap"], summary["frames"]
+        lines.append("")
+        lines.append(f"heap: current {heap['current'] / 1024:,.1f} KiB, peak {heap['peak'] / 1024:,.1f} KiB")
+        if frames["count"]:
+            lines.append(f"frames: {frames['count']}, peak per frame max {frames['max_peak'] / 1024:,.1f} KiB, "
+                         f"mean {frames['mean_peak'] / 1024:,.1f} KiB, {frames['mean_allocations']:,.1f} allocations/frame")
+        for leak in summary["leaks"]:
+            lines.append(f"possible leak: {leak['name']} now {leak['size']:,} (+{leak['growth_per_frame']:,.1f}/frame)")
+        return "\n".join(lines)
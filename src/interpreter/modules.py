@@ -0,0 +1,134 @@
+import hashlib
+import os
+import time
+from lexer.lexer import Lexer, TOK_EOF
+from parser.pratt import PrattParser
+from .interpreter import Module, SymbolTable
+from .stdlib import load_stdlib
+
+MODULE_SUFFIX = ".gem"
+
+class ParsedModule:
+    def __init__(self, path, mtime, size, digest, nodes):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.nodes = nodes
+
+# Parsed modules shared by every interpreter in the process. Entries are keyed
+# by path and validated by mtime/size first and content hash second, so a
+# touched but unchanged file is not parsed again.
+parse_cache = {}
+
+def parse_source(text):
+    lexer = Lexer(text)
+    tokens = []
+    token = lexer.get_next_token()
+    while token.type != TOK_EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    tokens.append(token)
+    return PrattParser(tokens).parse()
+
+def parse_module(path):
+    # Returns the module's AST and whether it came from the cache.
+    stat = os.stat(path)
+    entry = parse_cache.get(path)
+    if entry and entry.mtime == stat.st_mtime_ns and entry.size == stat.st_size:
+        return entry.nodes, True
+    with open(path, 'rb') as f: data = f.read()
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    if entry and entry.digest == digest:
+        entry.mtime, entry.size = stat.st_mtime_ns, stat.st_size
+        return entry.nodes, True
+    try:
+        nodes = parse_source(data.decode('utf-8'))
+    except Exception as e:
+        raise Exception(f"Cannot parse module '{path}': {e}")
+    parse_cache[path] = ParsedModule(path, stat.st_mtime_ns, stat.st_size, digest, nodes)
+    return nodes, False
+
+class ModuleTiming:
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.cached = False
+        self.parse = 0.0
+        self.run = 0.0
+        self.total = 0.0
+        self.imports = 0
+
+class ModuleLoader:
+    # Resolves, parses and runs imported modules. Each module runs once per
+    # interpreter, in its own top-level SymbolTable; later imports share it.
+    def __init__(self, interpreter, search_path=(), main_path=None):
+        self.interpreter = interpreter
+        env_path = [p for p in os.environ.get("GEMPATH", "").split(os.pathsep) if p]
+        self.search_path = list(search_path) + env_path
+        self.modules = {}
+        self.loading = [os.path.realpath(main_path)] if main_path else []
+        self.timings = {}
+        self.child_time = [0.0]
+
+    def resolve(self, name):
+        if os.path.isabs(name):
+            candidates = [name]
+        else:
+            importer_dir = os.path.dirname(self.loading[-1]) if self.loading else os.getcwd()
+            candidates = [os.path.join(d, name) for d in [importer_dir, os.getcwd()] + self.search_path]
+        for candidate in candidates:
+            if os.path.isfile(candidate): return os.path.realpath(candidate)
+        raise Exception(f"Cannot find module '{name}'")
+
+    def load(self, name):
+        path = self.resolve(name)
+        if path in self.loading:
+            cycle = self.loading[self.loading.index(path):] + [path]
+            raise Exception("Import cycle: " + " -> ".join(os.path.basename(p) for p in cycle))
+        module = self.modules.get(path)
+        if module:
+            self.timings[path].imports += 1
+            return module
+
+        module_name = os.path.basename(path)
+        if module_name.endswith(MODULE_SUFFIX): module_name = module_name[:-len(MODULE_SUFFIX)]
+        if not module_name.isidentifier():
+            raise Exception(f"Module name '{module_name}' is not an identifier; use import \"{name}\" as <name>")
+
+        timing = ModuleTiming(module_name, path)
+        start = time.perf_counter()
+        nodes, timing.cached = parse_module(path)
+        timing.parse = time.perf_counter() - start
+
+        table = SymbolTable()
+        load_stdlib(table)
+        module = Module(module_name, path, table)
+        interpreter = self.interpreter
+        previous_scope, previous_module = interpreter.current_symbol_table, interpreter.module_table
+        interpreter.current_symbol_table = interpreter.module_table = table
+        self.loading.append(path)
+        self.child_time.append(0.0)
+        run_start = time.perf_counter()
+        try:
+            for node in nodes: interpreter.visit(node)
+        finally:
+            interpreter.current_symbol_table, interpreter.module_table = previous_scope, previous_module
+            self.loading.pop()
+            nested = self.child_time.pop()
+        timing.run = time.perf_counter() - run_start - nested
+        timing.total = time.perf_counter() - start
+        timing.imports = 1
+        self.child_time[-1] += timing.total
+        self.timings[path] = timing
+        self.modules[path] = module
+        return module
+
+    def format_report(self):
+        lines = ["== Module load times ==",
+                 f"{'module':<24} {'source':<7} {'parse ms':>9} {'run ms':>9} {'total ms':>9} {'imports':>8}"]
+        for timing in sorted(self.timings.values(), key=lambda t: -t.total):
+            lines.append(f"{timing.name:<24} {'cache' if timing.cached else 'parsed':<7} {timing.parse * 1000:>9.2f} "
+                         f"{timing.run * 1000:>9.2f} {timing.total * 1000:>9.2f} {timing.imports:>8}")
+        lines.append(f"{len(self.timings)} modules loaded in {self.child_time[0] * 1000:.2f} ms (run ms excludes nested imports)")
+        return "\n".join(lines)
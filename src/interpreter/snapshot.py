@@ -0,0 +1,76 @@
+import gc
+import os
+import pickle
+import sys
+from .stdlib import BuiltinFunction
+
+IMAGE_MAGIC = b"GEMIMG"
+IMAGE_VERSION = 3
+
+class ImagePickler(pickle.Pickler):
+    # Builtins are stored by name and re-linked on load, so an image never
+    # embeds Python function references and survives stdlib changes. Functions
+    # point at the global table, which is re-linked to the loading interpreter's.
+    def __init__(self, f, globals_table, **kwargs):
+        super().__init__(f, **kwargs)
+        self.globals_table = globals_table
+
+    def persistent_id(self, obj):
+        if isinstance(obj, BuiltinFunction): return ("builtin", obj.name)
+        if obj is self.globals_table: return ("globals", None)
+        return None
+
+class ImageUnpickler(pickle.Unpickler):
+    def __init__(self, f, globals_table):
+        super().__init__(f)
+        self.globals_table = globals_table
+        self.builtins = globals_table.symbols
+
+    def persistent_load(self, pid):
+        kind, name = pid
+        if kind == "globals": return self.globals_table
+        builtin = self.builtins.get(name)
+        if kind != "builtin" or not isinstance(builtin, BuiltinFunction):
+            raise Exception(f"Image refers to unknown builtin '{name}'")
+        return builtin
+
+def deep_recursion():
+    # Long bodies and expressions pickle recursively, and the collector would
+    # otherwise rescan the growing object graph many times during a load.
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 20000))
+    gc.disable()
+    return limit
+
+def restore(limit):
+    sys.setrecursionlimit(limit)
+    gc.enable()
+
+def save_image(interpreter, path):
+    symbols = {name: value for name, value in interpreter.global_symbol_table.symbols.items()
+               if not isinstance(value, BuiltinFunction)}
+    limit = deep_recursion()
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(IMAGE_MAGIC + bytes([IMAGE_VERSION]))
+            ImagePickler(f, interpreter.global_symbol_table, protocol=pickle.HIGHEST_PROTOCOL).dump(symbols)
+        os.replace(tmp_path, path)
+    except (pickle.PicklingError, TypeError) as e:
+        raise Exception(f"Cannot snapshot interpreter: {e}")
+    finally:
+        restore(limit)
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+
+def load_image(interpreter, path):
+    table = interpreter.global_symbol_table
+    limit = deep_recursion()
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(len(IMAGE_MAGIC) + 1)
+            if header[:len(IMAGE_MAGIC)] != IMAGE_MAGIC: raise Exception(f"'{path}' is not a Gemstone image")
+            if header[-1] != IMAGE_VERSION: raise Exception(f"Unsupported image version {header[-1]}")
+            symbols = ImageUnpickler(f, table).load()
+    finally:
+        restore(limit)
+    table.symbols.update(symbols)
@@ -0,0 +1,52 @@
+import importlib
+
+# Builtin names per stdlib module. Modules are only imported the first time
+# one of their builtins is called, so a pure-compute script never pays for
+# e.g. the asyncio import in tasks.
+MODULES = {
+    "core": [
+        "print", "len", "push", "pop",
+        "map", "filter", "take", "collect", "retain", "sort", "reverse", "slice", "index_of",
+        "Set", "Deque", "add", "has", "remove", "push_front", "pop_front",
+        "Builder", "Append", "Join", "ToString",
+    ],
+    "math": ["Random", "Sin", "Cos", "Floor"],
+    "io": ["ReadFile", "WriteFile", "Open", "ReadLine", "Lines", "Write", "Flush", "Close"],
+    "binary": [
+        "Buffer", "MapFile", "ReadBytes", "WriteBytes", "Decode",
+        "ReadU8", "ReadU16", "ReadU32", "ReadI32", "ReadF32", "ReadF64",
+    ],
+    "tasks": ["spawn", "await", "cancel", "sleep", "Channel", "send", "receive"],
+    "spatial": ["Grid", "GridInsert", "GridMove", "GridRemove", "GridQueryRect", "GridQueryRadius"],
+    "graphics": [
+        "InitWindow", "Rect", "Text", "LoadImage", "DrawImage",
+        "LoadSheet", "ImageStats", "ImageCacheLimit",
+        "KeyDown", "MouseX", "MouseY", "MouseDown", "GameLoop",
+    ],
+}
+
+def import_module(module):
+    return importlib.import_module(f"{__name__}.{module}")
+
+class BuiltinFunction:
+    def __init__(self, name, func=None, module=None):
+        self.name = name
+        self.module = module
+        if func is not None: self.func = func
+        self.arg_names = ['...args']
+
+    def __getattr__(self, attr):
+        # Only reached while a lazily registered builtin is still a stub.
+        module = self.__dict__.get('module')
+        if attr != 'func' or module is None: raise AttributeError(attr)
+        self.func = import_module(module).BUILTINS[self.name]
+        return self.func
+
+    def __repr__(self): return f"<native {self.name}>"
+
+def load_stdlib(symbol_table, eager=False):
+    for module, names in MODULES.items():
+        for name in names:
+            builtin = BuiltinFunction(name, module=module)
+            if eager: builtin.func
+            symbol_table.set(name, builtin)
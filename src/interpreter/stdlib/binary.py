@@ -0,0 +1,107 @@
+import mmap
+import os
+import struct
+from .io import run_blocking
+
+class Buffer:
+    # Bytes value backed by a memoryview. Indexing gives byte values as ints;
+    # slicing gives another Buffer over the same memory, without copying.
+    def __init__(self, view, source=None):
+        self.view = view if view.format == 'B' else view.cast('B')
+        self.source = source
+
+    def __len__(self): return len(self.view)
+    def __iter__(self): return iter(self.view)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice): return Buffer(self.view[key], self.source)
+        return self.view[key]
+
+    def set_item(self, index, value):
+        if self.view.readonly: raise Exception(f"Cannot assign to read-only {self}")
+        try: self.view[index] = value
+        except (ValueError, TypeError): raise Exception(f"Buffer items are bytes (0-255), got {value}")
+
+    def __eq__(self, other): return isinstance(other, Buffer) and self.view == other.view
+    __hash__ = None
+
+    def __reduce__(self):
+        if isinstance(self.source, mmap.mmap): raise Exception(f"Cannot snapshot mapped file {self}")
+        return (restore_buffer, (self.view.tobytes(), self.view.readonly))
+
+    def __repr__(self): return f"<buffer {len(self.view)} bytes{' read-only' if self.view.readonly else ''}>"
+
+def restore_buffer(data, readonly):
+    return Buffer(memoryview(data if readonly else bytearray(data)))
+
+def get_buffer(args, name):
+    buf = args[0] if args else None
+    if not isinstance(buf, Buffer): raise Exception(f"{name} expects a buffer, got {buf}")
+    return buf
+
+def bin_buffer(interpreter, args):
+    source = args[0] if args else 0
+    try:
+        if isinstance(source, str): data = bytearray(source.encode('utf-8'))
+        elif isinstance(source, Buffer): data = bytearray(source.view)
+        else: data = bytearray(source)
+    except (ValueError, TypeError):
+        raise Exception(f"Cannot make a buffer from {source}")
+    return Buffer(memoryview(data))
+
+def bin_map_file(interpreter, args):
+    path, mode = args[0], args[1] if len(args) > 1 else 'r'
+    if mode not in ('r', 'w'): raise Exception(f"Invalid map mode '{mode}'")
+    try:
+        with open(path, 'rb' if mode == 'r' else 'r+b') as f:
+            # mmap cannot map an empty file.
+            if os.fstat(f.fileno()).st_size == 0: return Buffer(memoryview(b'' if mode == 'r' else bytearray()))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ if mode == 'r' else mmap.ACCESS_WRITE)
+    except OSError as e:
+        raise Exception(f"Cannot map file '{path}': {e.strerror}")
+    return Buffer(memoryview(mapped), mapped)
+
+def read_bytes(path):
+    with open(path, 'rb') as f: return f.read()
+
+def write_bytes(path, view):
+    with open(path, 'wb') as f: f.write(view)
+
+def bin_read_bytes(interpreter, args):
+    try: return Buffer(memoryview(run_blocking(interpreter, read_bytes, args[0])))
+    except OSError as e: raise Exception(f"Cannot read file '{args[0]}': {e.strerror}")
+
+def bin_write_bytes(interpreter, args):
+    buf = get_buffer(args[1:], "WriteBytes")
+    try: run_blocking(interpreter, write_bytes, args[0], buf.view)
+    except OSError as e: raise Exception(f"Cannot write file '{args[0]}': {e.strerror}")
+    return None
+
+def bin_decode(interpreter, args):
+    buf = get_buffer(args, "Decode")
+    try: return str(buf.view, args[1] if len(args) > 1 else 'utf-8')
+    except (UnicodeDecodeError, LookupError) as e: raise Exception(f"Cannot decode {buf}: {e}")
+
+def typed_reader(name, code):
+    # Little-endian unless "big" is passed after the offset.
+    little, big = struct.Struct('<' + code), struct.Struct('>' + code)
+    def read(interpreter, args):
+        buf = get_buffer(args, name)
+        layout = big if len(args) > 2 and args[2] == "big" else little
+        try: return layout.unpack_from(buf.view, args[1])[0]
+        except struct.error: raise Exception(f"{name}: offset {args[1]} is out of range for {buf}")
+    return read
+
+BUILTINS = {
+    "Buffer": bin_buffer,
+    "MapFile": bin_map_file,
+    "ReadBytes": bin_read_bytes,
+    "WriteBytes": bin_write_bytes,
+    "Decode": bin_decode,
+    "ReadU8": typed_reader("ReadU8", 'B'),
+    "ReadU16": typed_reader("ReadU16", 'H'),
+    "ReadU32": typed_reader("ReadU32", 'I'),
+    "ReadI32": typed_reader("ReadI32", 'i'),
+    "ReadF32": typed_reader("ReadF32", 'f'),
+    "ReadF64": typed_reader("ReadF64", 'd'),
+}
@@ -0,0 +1,166 @@
+import collections
+import itertools
+
+def std_print(interpreter, args): print(*args); return None
+def std_len(interpreter, args): return len(args[0])
+def std_push(interpreter, args):
+    if isinstance(args[0], set): args[0].add(args[1])
+    else: args[0].append(args[1])
+    return None
+def std_pop(interpreter, args): return args[0].pop()
+
+def check_callable(func, name):
+    if not hasattr(func, 'arg_names'): raise Exception(f"{name} expects a function, got {func}")
+    return func
+
+def is_lazy(source):
+    # Iterators (generators, Lines, earlier lazy stages) stay lazy through
+    # map/filter/take; collections still produce lists.
+    return iter(source) is source
+
+class LazyStage:
+    def __init__(self, name, items):
+        self.name = name
+        self.items = items
+    def __iter__(self): return self
+    def __next__(self): return next(self.items)
+    def __reduce__(self): raise Exception(f"Cannot snapshot {self}")
+    def __repr__(self): return f"<lazy {self.name}>"
+
+def lazy_map(interpreter, func, source):
+    for item in source: yield interpreter.call_value(func, [item])
+
+def lazy_filter(interpreter, func, source):
+    for item in source:
+        if interpreter.call_value(func, [item]): yield item
+
+def lazy_take(source, count):
+    if count <= 0: return
+    for item in source:
+        yield item
+        count -= 1
+        if count <= 0: return
+
+def coll_map(interpreter, args):
+    func = check_callable(args[1], "map")
+    if is_lazy(args[0]): return LazyStage("map", lazy_map(interpreter, func, args[0]))
+    return [interpreter.call_value(func, [item]) for item in args[0]]
+
+def coll_filter(interpreter, args):
+    func = check_callable(args[1], "filter")
+    if is_lazy(args[0]): return LazyStage("filter", lazy_filter(interpreter, func, args[0]))
+    return [item for item in args[0] if interpreter.call_value(func, [item])]
+
+def coll_take(interpreter, args):
+    if is_lazy(args[0]): return LazyStage("take", lazy_take(args[0], args[1]))
+    return list(itertools.islice(args[0], max(args[1], 0)))
+
+def coll_collect(interpreter, args): return list(args[0])
+
+def coll_retain(interpreter, args):
+    func = check_callable(args[1], "retain")
+    args[0][:] = [item for item in args[0] if interpreter.call_value(func, [item])]
+    return None
+
+def coll_sort(interpreter, args):
+    if len(args) > 1:
+        func = check_callable(args[1], "sort")
+        args[0].sort(key=lambda item: interpreter.call_value(func, [item]))
+    else:
+        args[0].sort()
+    return None
+
+def coll_reverse(interpreter, args): args[0].reverse(); return None
+def coll_slice(interpreter, args): return args[0][args[1]:args[2] if len(args) > 2 else None]
+
+def coll_index_of(interpreter, args):
+    if isinstance(args[0], str): return args[0].find(str(args[1]))
+    for i, item in enumerate(args[0]):
+        if item == args[1]: return i
+    return -1
+
+def coll_set(interpreter, args): return set(args[0]) if args else set()
+def coll_deque(interpreter, args): return collections.deque(args[0]) if args else collections.deque()
+def coll_add(interpreter, args): args[0].add(args[1]); return None
+def coll_has(interpreter, args): return 1 if args[1] in args[0] else 0
+
+def coll_remove(interpreter, args):
+    coll, item = args[0], args[1]
+    if isinstance(coll, set): coll.discard(item)
+    elif isinstance(coll, dict): coll.pop(item, None)
+    elif item in coll: coll.remove(item)
+    return None
+
+def coll_push_front(interpreter, args):
+    if isinstance(args[0], collections.deque): args[0].appendleft(args[1])
+    else: args[0].insert(0, args[1])
+    return None
+
+def coll_pop_front(interpreter, args):
+    if isinstance(args[0], collections.deque): return args[0].popleft()
+    return args[0].pop(0)
+
+class StringBuilder:
+    # Appends are O(1); the parts are only joined (and collapsed into a single
+    # part) when the text is actually needed.
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def append(self, value):
+        text = str(value)
+        self.parts.append(text)
+        self.length += len(text)
+
+    def __str__(self):
+        if len(self.parts) > 1: self.parts = [''.join(self.parts)]
+        return self.parts[0] if self.parts else ''
+
+    def __len__(self): return self.length
+    def __add__(self, other): return str(self) + str(other)
+    def __radd__(self, other): return str(other) + str(self)
+    def __repr__(self): return str(self)
+
+def str_builder(interpreter, args):
+    sb = StringBuilder()
+    for value in args: sb.append(value)
+    return sb
+
+def str_append(interpreter, args):
+    sb = args[0]
+    if not isinstance(sb, StringBuilder): raise Exception(f"Append expects a string builder, got {sb}")
+    for value in args[1:]: sb.append(value)
+    return sb
+
+def str_join(interpreter, args):
+    sep = str(args[1]) if len(args) > 1 else ''
+    return sep.join(str(value) for value in args[0])
+
+def str_to_string(interpreter, args): return str(args[0])
+
+BUILTINS = {
+    "print": std_print,
+    "len": std_len,
+    "push": std_push,
+    "pop": std_pop,
+    "map": coll_map,
+    "filter": coll_filter,
+    "take": coll_take,
+    "collect": coll_collect,
+    "retain": coll_retain,
+    "sort": coll_sort,
+    "reverse": coll_reverse,
+    "slice": coll_slice,
+    "index_of": coll_index_of,
+    "Set": coll_set,
+    "Deque": coll_deque,
+    "add": coll_add,
+    "has": coll_has,
+    "remove": coll_remove,
+    "push_front": coll_push_front,
+    "pop_front": coll_pop_front,
+    "Builder": str_builder,
+    "Append": str_append,
+    "Join": str_join,
+    "ToString": str_to_string,
+}
@@ -0,0 +1,262 @@
+import os
+import struct
+import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tk's values for the colour names scripts commonly use.
+COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0),
+    "green": (0, 255, 0), "blue": (0, 0, 255), "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255), "magenta": (255, 0, 255), "orange": (255, 165, 0),
+    "purple": (160, 32, 240), "pink": (255, 192, 203), "brown": (165, 42, 42),
+    "gray": (190, 190, 190), "grey": (190, 190, 190), "darkgray": (169, 169, 169),
+    "darkgrey": (169, 169, 169), "lightgray": (211, 211, 211), "lightgrey": (211, 211, 211),
+    "gold": (255, 215, 0), "navy": (0, 0, 128), "lime": (50, 205, 50),
+    "darkgreen": (0, 100, 0), "darkblue": (0, 0, 139), "darkred": (139, 0, 0),
+}
+
+# 3x5 bitmap font: one octal digit per row, high bit on the left.
+FONT = {
+    "A": "25755", "B": "65656", "C": "34443", "D": "65556", "E": "74647", "F": "74644",
+    "G": "34553", "H": "55755", "I": "72227", "J": "11152", "K": "55655", "L": "44447",
+    "M": "57755", "N": "65555", "O": "25552", "P": "65644", "Q": "25563", "R": "65655",
+    "S": "34216", "T": "72222", "U": "55557", "V": "55552", "W": "55775", "X": "55255",
+    "Y": "55222", "Z": "71247", "0": "75557", "1": "26227", "2": "61247", "3": "61216",
+    "4": "55711", "5": "74616", "6": "34652", "7": "71222", "8": "25252", "9": "25316",
+    " ": "00000", ".": "00002", ",": "00024", ":": "02020", "!": "22202", "?": "61202",
+    "-": "00700", "+": "02720", "/": "11244", "(": "24442", ")": "21112", "=": "07070",
+    "_": "00007", "%": "51245", "<": "12421", ">": "42124", "*": "05250", "[": "64446",
+    "]": "31113", "#": "57575", "'": "22000", '"': "55000",
+}
+
+def parse_color(color):
+    if isinstance(color, str):
+        name = color.strip().lower()
+        if name in COLORS: return COLORS[name]
+        if name.startswith("#") and len(name) in (4, 7):
+            digits = name[1:]
+            if len(digits) == 3: digits = "".join(d * 2 for d in digits)
+            try: return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+            except ValueError: pass
+    raise Exception(f"Unknown color '{color}'")
+
+class Bitmap:
+    # Decoded image: an (h, w, 3) uint8 array plus an optional (h, w) alpha.
+    def __init__(self, pixels, alpha=None):
+        self.pixels = pixels
+        self.alpha = alpha
+
+    def width(self): return self.pixels.shape[1]
+    def height(self): return self.pixels.shape[0]
+    def nbytes(self): return self.pixels.nbytes + (self.alpha.nbytes if self.alpha is not None else 0)
+
+def read_ppm(data):
+    # Binary P6 only; header tokens may be separated by comments.
+    fields, pos = [], 2
+    while len(fields) < 3:
+        while data[pos:pos + 1].isspace(): pos += 1
+        if data[pos:pos + 1] == b"#":
+            pos = data.index(b"\n", pos) + 1
+            continue
+        end = pos
+        while not data[end:end + 1].isspace(): end += 1
+        fields.append(int(data[pos:end]))
+        pos = end
+    width, height, maxval = fields
+    if maxval != 255: raise Exception("Only 8-bit PPM images are supported")
+    pixels = np.frombuffer(data, np.uint8, width * height * 3, pos + 1).reshape(height, width, 3)
+    return Bitmap(pixels.copy())
+
+def unfilter_png(raw, width, height, bpp):
+    stride = width * bpp
+    rows = np.frombuffer(raw, np.uint8).reshape(height, stride + 1)
+    out = np.zeros((height, stride), np.uint8)
+    prior = np.zeros(stride, np.uint8)
+    for y in range(height):
+        kind, line = rows[y, 0], rows[y, 1:]
+        if kind == 0: row = line.copy()
+        elif kind == 1:
+            row = np.cumsum(line.reshape(width, bpp), axis=0, dtype=np.uint8).reshape(stride)
+        elif kind == 2: row = line + prior
+        else:
+            row = line.astype(np.int32)
+            up = prior.astype(np.int32)
+            for x in range(stride):
+                left = row[x - bpp] if x >= bpp else 0
+                if kind == 3:
+                    row[x] = (row[x] + ((left + up[x]) >> 1)) & 0xFF
+                else:
+                    corner = up[x - bpp] if x >= bpp else 0
+                    p = left + up[x] - corner
+                    pa, pb, pc = abs(p - left), abs(p - up[x]), abs(p - corner)
+                    pred = left if pa <= pb and pa <= pc else (up[x] if pb <= pc else corner)
+                    row[x] = (row[x] + pred) & 0xFF
+            row = row.astype(np.uint8)
+        out[y] = row
+        prior = row
+    return out
+
+def read_png(data):
+    pos, idat, palette, trns = 8, [], None, None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"PLTE": palette = np.frombuffer(chunk, np.uint8).reshape(-1, 3)
+        elif kind == b"tRNS": trns = np.frombuffer(chunk, np.uint8)
+        elif kind == b"IDAT": idat.append(chunk)
+        elif kind == b"IEND": break
+    if depth != 8 or interlace: raise Exception("Only 8-bit, non-interlaced PNG images are supported")
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    img = unfilter_png(zlib.decompress(b"".join(idat)), width, height, channels).reshape(height, width, channels)
+    alpha = None
+    if color_type == 3:
+        indices = img[:, :, 0]
+        pixels = palette[indices]
+        if trns is not None:
+            table = np.full(256, 255, np.uint8)
+            table[:len(trns)] = trns
+            alpha = table[indices]
+    elif color_type in (0, 4):
+        pixels = np.repeat(img[:, :, :1], 3, axis=2)
+        if color_type == 4: alpha = img[:, :, 1].copy()
+    else:
+        pixels = img[:, :, :3]
+        if color_type == 6: alpha = img[:, :, 3].copy()
+    return Bitmap(np.ascontiguousarray(pixels), alpha)
+
+def png_chunk(kind, payload):
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload) & 0xFFFFFFFF)
+
+def encode_png(pixels):
+    height, width, _ = pixels.shape
+    rows = np.zeros((height, width * 3 + 1), np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 3)
+    return (b"\x89PNG\r\n\x1a\n"
+            + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+            + png_chunk(b"IEND", b""))
+
+class FramebufferRenderer:
+    # Software renderer for VirtualMachine: draws into an RGB NumPy array with
+    # slice fills and blits, and can dump every frame as PPM or PNG.
+    def __init__(self, width=600, height=400, output_dir=None, frame_format="png"):
+        if np is None: raise Exception("The framebuffer backend needs numpy (pip install numpy)")
+        if frame_format not in ("ppm", "png"): raise Exception(f"Unknown frame format '{frame_format}'")
+        self.output_dir = output_dir
+        self.frame_format = frame_format
+        self.frame = 0
+        self.render_time = 0.0
+        self.output_time = 0.0
+        self.colors = {}
+        self.glyphs = {ch: np.array([[int(d) >> (2 - b) & 1 for b in range(3)] for d in rows], bool)
+                       for ch, rows in FONT.items()}
+        self.scaled_glyphs = {}
+        if output_dir: os.makedirs(output_dir, exist_ok=True)
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.width = int(width)
+        self.height = int(height)
+        self.fb = np.zeros((self.height, self.width, 3), np.uint8)
+
+    def color(self, c):
+        rgb = self.colors.get(c)
+        if rgb is None: rgb = self.colors[c] = np.array(parse_color(c), np.uint8)
+        return rgb
+
+    def clip(self, x, y, w, h):
+        x0, y0 = max(0, int(round(x))), max(0, int(round(y)))
+        x1, y1 = min(self.width, int(round(x + w))), min(self.height, int(round(y + h)))
+        return x0, y0, x1, y1
+
+    def clear(self):
+        start = time.perf_counter()
+        self.fb.fill(0)
+        self.render_time += time.perf_counter() - start
+
+    def draw_rect(self, x, y, w, h, c):
+        start = time.perf_counter()
+        x0, y0, x1, y1 = self.clip(x, y, w, h)
+        if x0 < x1 and y0 < y1: self.fb[y0:y1, x0:x1] = self.color(c)
+        self.render_time += time.perf_counter() - start
+
+    def glyph(self, ch, scale):
+        key = (ch, scale)
+        mask = self.scaled_glyphs.get(key)
+        if mask is None:
+            base = self.glyphs.get(ch.upper(), self.glyphs["?"])
+            mask = self.scaled_glyphs[key] = np.kron(base, np.ones((scale, scale), bool))
+        return mask
+
+    def draw_text(self, text, x, y, size, c):
+        start = time.perf_counter()
+        rgb = self.color(c)
+        scale = max(1, int(size) // 7)
+        cx, cy = int(round(x)), int(round(y))
+        for ch in str(text):
+            mask = self.glyph(ch, scale)
+            self.blit_mask(mask, cx, cy, rgb)
+            cx += 4 * scale
+        self.render_time += time.perf_counter() - start
+
+    def blit_mask(self, mask, x, y, rgb):
+        h, w = mask.shape
+        x0, y0, x1, y1 = self.clip(x, y, w, h)
+        if x0 >= x1 or y0 >= y1: return
+        self.fb[y0:y1, x0:x1][mask[y0 - y:y1 - y, x0 - x:x1 - x]] = rgb
+
+    def draw_image(self, img, x, y):
+        start = time.perf_counter()
+        x, y = int(round(x)), int(round(y))
+        x0, y0, x1, y1 = self.clip(x, y, img.width(), img.height())
+        if x0 < x1 and y0 < y1:
+            src = img.pixels[y0 - y:y1 - y, x0 - x:x1 - x]
+            dst = self.fb[y0:y1, x0:x1]
+            if img.alpha is None:
+                dst[...] = src
+            else:
+                a = img.alpha[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(np.uint16)
+                dst[...] = ((src * a + dst * (255 - a)) // 255).astype(np.uint8)
+        self.render_time += time.perf_counter() - start
+
+    def decode_image(self, path):
+        with open(path, 'rb') as f: data = f.read()
+        if data[:2] == b"P6": img = read_ppm(data)
+        elif data[:8] == b"\x89PNG\r\n\x1a\n": img = read_png(data)
+        else: raise Exception(f"'{path}' is not a PPM or PNG image")
+        return img, img.nbytes()
+
+    def crop_image(self, img, rect):
+        # Slices are views into the sheet, so frames cost no pixel copies.
+        x0, y0, x1, y1 = rect
+        alpha = img.alpha[y0:y1, x0:x1] if img.alpha is not None else None
+        frame = Bitmap(img.pixels[y0:y1, x0:x1], alpha)
+        return frame, 0
+
+    def scale_image(self, img, scale):
+        rows = (np.arange(max(1, int(img.height() * scale))) / scale).astype(int)
+        cols = (np.arange(max(1, int(img.width() * scale))) / scale).astype(int)
+        alpha = img.alpha[np.ix_(rows, cols)] if img.alpha is not None else None
+        scaled = Bitmap(img.pixels[np.ix_(rows, cols)], alpha)
+        return scaled, scaled.nbytes()
+
+    def end_frame(self):
+        self.frame += 1
+        if not self.output_dir: return
+        start = time.perf_counter()
+        path = os.path.join(self.output_dir, f"frame_{self.frame:05d}.{self.frame_format}")
+        with open(path, 'wb') as f:
+            if self.frame_format == "ppm":
+                f.write(f"P6\n{self.width} {self.height}\n255\n".encode())
+                f.write(self.fb.tobytes())
+            else:
+                f.write(encode_png(self.fb))
+        self.output_time += time.perf_counter() - start
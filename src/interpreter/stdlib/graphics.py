@@ -0,0 +1,304 @@
+import sys
+import time
+from .imagecache import ImageCache, SpriteSheet, image_size
+
+class VirtualMachine:
+    def __init__(self):
+        self.root = None
+        self.canvas = None
+        self.width = 600
+        self.height = 400
+        self.running = False
+        self.headless = False
+        
+        self.keys_down = set()
+        self.mouse_x = 0
+        self.mouse_y = 0
+        self.mouse_down = False
+        self.interpreter = None
+        self.update_func = None
+        # Optional software renderer (see framebuffer.py); when set, drawing
+        # goes to it instead of the Tk canvas and GameLoop runs max_frames frames.
+        self.renderer = None
+        self.max_frames = None
+        # Input recording/replay (see replay.py). While replaying, live window
+        # events are ignored so every run sees the recorded input.
+        self.recorder = None
+        self.player = None
+        self.update_time = 0.0
+        self.frames = 0
+        self.image_cache = ImageCache()
+        # Canvas image items are pooled and re-pointed every frame instead of
+        # being deleted and recreated; item_images keeps shown images alive
+        # even if the cache evicts them mid-frame.
+        self.image_items = []
+        self.item_images = []
+        self.items_used = 0
+
+    def init_hardware(self, w, h, title):
+        self.width = w
+        self.height = h
+        if self.renderer:
+            self.renderer.resize(w, h)
+            return
+        try:
+            # Imported here so framebuffer and replay runs work without Tk.
+            import tkinter as tk
+            self.root = tk.Tk()
+            self.root.title(title)
+            self.root.geometry(f"{self.width}x{self.height}")
+            self.root.resizable(False, False)
+            self.canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg="black", highlightthickness=0)
+            self.canvas.pack()
+            self.root.bind("<KeyPress>", self._on_key_down)
+            self.root.bind("<KeyRelease>", self._on_key_up)
+            self.root.bind("<Motion>", self._on_mouse_move)
+            self.root.bind("<Button-1>", self._on_mouse_click)
+            self.root.bind("<ButtonRelease-1>", self._on_mouse_release)
+            self.root.protocol("WM_DELETE_WINDOW", self._exit)
+        except Exception as e:
+            self.headless = True
+            print(f"!! HEADLESS MODE ACTIVATED (Window failed: {e}) !!")
+            print("Press Ctrl+C to exit.")
+
+    def _on_key_down(self, e):
+        if not self.player: self.keys_down.add(e.keysym.lower())
+    def _on_key_up(self, e):
+        if not self.player: self.keys_down.discard(e.keysym.lower())
+    def _on_mouse_move(self, e):
+        if not self.player: self.mouse_x, self.mouse_y = e.x, e.y
+    def _on_mouse_click(self, e):
+        if not self.player: self.mouse_down = True
+    def _on_mouse_release(self, e):
+        if not self.player: self.mouse_down = False
+    def _exit(self): 
+        self.running = False
+        try: self.root.destroy()
+        except: pass
+        sys.exit(0)
+
+    def decode_image(self, path):
+        import tkinter as tk
+        img = tk.PhotoImage(file=path)
+        return img, img.width() * img.height() * 4
+
+    def scale_image(self, img, scale):
+        # Tk can only scale by whole factors.
+        if scale >= 1: img = img.zoom(max(1, round(scale)))
+        else: img = img.subsample(max(1, round(1 / scale)))
+        return img, img.width() * img.height() * 4
+
+    def crop_image(self, img, rect):
+        import tkinter as tk
+        x0, y0, x1, y1 = rect
+        frame = tk.PhotoImage(width=x1 - x0, height=y1 - y0)
+        frame.tk.call(frame, 'copy', img, '-from', x0, y0, x1, y1, '-to', 0, 0)
+        return frame, (x1 - x0) * (y1 - y0) * 4
+
+    def get_image(self, path, rect=None, scale=1):
+        cache = self.image_cache
+        backend = self.renderer or self
+        if rect is None and scale == 1:
+            return cache.get((path, None, 1), lambda: backend.decode_image(path))
+        if scale == 1:
+            return cache.get((path, rect, 1), lambda: backend.crop_image(self.get_image(path), rect))
+        return cache.get((path, rect, scale), lambda: backend.scale_image(self.get_image(path, rect), scale))
+
+    def load_image(self, path):
+        if self.headless: return path
+        try:
+            self.get_image(path)
+            return path
+        except Exception as e:
+            print(f"Failed to load image: {e}")
+            return None
+
+    def load_sheet(self, path, frame_w, frame_h):
+        try:
+            if self.headless:
+                # Nothing is decoded headless, but frame numbers are still
+                # checked against the sheet's real size.
+                width, height = image_size(path)
+            else:
+                img = self.get_image(path)
+                width, height = img.width(), img.height()
+        except Exception as e:
+            raise Exception(f"Failed to load sprite sheet: {e}")
+        return SpriteSheet(path, frame_w, frame_h, width, height)
+
+    def draw_image(self, path, x, y, rect=None, scale=1):
+        if self.renderer and path is not None:
+            return self.renderer.draw_image(self.get_image(path, rect, scale), x, y)
+        if self.headless or not self.canvas or path is None: return
+        img = self.get_image(path, rect, scale)
+        canvas = self.canvas
+        if self.items_used < len(self.image_items):
+            item = self.image_items[self.items_used]
+            canvas.itemconfigure(item, image=img, state="normal")
+            canvas.coords(item, x, y)
+            canvas.tag_raise(item)
+            self.item_images[self.items_used] = img
+        else:
+            self.image_items.append(canvas.create_image(x, y, image=img, anchor="nw"))
+            self.item_images.append(img)
+        self.items_used += 1
+
+    def clear_screen(self):
+        if self.renderer: return self.renderer.clear()
+        if self.canvas: self.canvas.delete("prim")
+        self.items_used = 0
+
+    def end_frame(self):
+        if self.renderer: return self.renderer.end_frame()
+        if not self.canvas: return
+        for i in range(self.items_used, len(self.image_items)):
+            if self.item_images[i] is not None:
+                self.canvas.itemconfigure(self.image_items[i], state="hidden")
+                self.item_images[i] = None
+
+    def draw_rect(self, x, y, w, h, c):
+        if self.renderer: return self.renderer.draw_rect(x, y, w, h, c)
+        if self.canvas: self.canvas.create_rectangle(x, y, x+w, y+h, fill=c, outline="", tags="prim")
+
+    def draw_text(self, text, x, y, s, c):
+        if self.renderer: return self.renderer.draw_text(text, x, y, s, c)
+        if self.canvas: self.canvas.create_text(x, y, text=str(text), fill=c, font=("Consolas", s), anchor="nw", tags="prim")
+
+    def start_loop(self, interpreter, func_node):
+        self.interpreter = interpreter
+        self.update_func = func_node
+        self.running = True
+        # Without a window, framebuffer, replay and --frames runs step frames
+        # back to back.
+        if not self.root and (self.renderer or self.player or self.max_frames is not None):
+            while self.running and (self.max_frames is None or self.frames < self.max_frames):
+                self._tick()
+            if self.renderer: self.report_timing()
+            return
+        self._tick()
+        if self.root: 
+            try:
+                self.root.mainloop()
+            except KeyboardInterrupt:
+                self._exit()
+        elif self.headless:
+            try:
+                while True: input()
+            except: pass
+
+    def _tick(self):
+        if not self.running: return
+        if self.max_frames is not None and self.frames >= self.max_frames:
+            self.running = False
+            if self.root: self.root.destroy()
+            return
+        if self.player and not self.player.apply(self):
+            # Like --frames: close the window and let GameLoop return, so the
+            # rest of the script and the task drain still run.
+            self.running = False
+            if self.root: self.root.destroy()
+            return
+        if self.recorder: self.recorder.record(self)
+        if self.interpreter.scheduler: self.interpreter.scheduler.run_ready()
+
+        profiler = self.interpreter.profiler
+        try:
+            if profiler: profiler.begin_frame()
+            start = time.perf_counter()
+            self.clear_screen()
+            self.interpreter.call_function(self.update_func, [])
+            self.update_time += time.perf_counter() - start
+            self.frames += 1
+            self.end_frame()
+            if profiler: profiler.end_frame()
+        except Exception as e:
+            print(f"\nRUNTIME ERROR in GameLoop: {e}")
+            self.running = False # Stop the loop so it doesn't spam errors
+            return
+
+        if self.root: self.root.after(16, self._tick)
+
+    def report_timing(self):
+        # Draw calls happen inside the update function, so interpreter time is
+        # the update time minus the renderer's share of it.
+        if not self.frames: return
+        render = self.renderer.render_time
+        interp = max(0.0, self.update_time - render)
+        per_frame = lambda t: t * 1000 / self.frames
+        print(f"Rendered {self.frames} frames: interpreter {per_frame(interp):.2f} ms/frame, "
+              f"render {per_frame(render):.2f} ms/frame, output {per_frame(self.renderer.output_time):.2f} ms/frame "
+              f"({'render' if render > interp else 'interpreter'}-bound)")
+
+vm = VirtualMachine()
+
+def check_main_thread(interpreter, name):
+    # Spawned tasks run on their own threads (see tasks.Scheduler) while the
+    # main thread waits for them, possibly inside a Tk callback; Tk calls
+    # from a task thread would deadlock, so drawing stays in GameLoop.
+    scheduler = interpreter.scheduler
+    if scheduler and scheduler.current is not None:
+        raise Exception(f"{name} cannot be called from a spawned task; draw from the GameLoop update function")
+
+def sys_init(interpreter, args):
+    check_main_thread(interpreter, "InitWindow")
+    vm.init_hardware(args[0], args[1], args[2] if len(args)>2 else "Gemstone VM")
+    return None
+
+def sys_draw_rect(interpreter, args):
+    check_main_thread(interpreter, "Rect")
+    vm.draw_rect(args[0], args[1], args[2], args[3], args[4])
+    return None
+
+def sys_draw_text(interpreter, args):
+    check_main_thread(interpreter, "Text")
+    vm.draw_text(args[0], args[1], args[2], args[3], args[4])
+    return None
+
+def sys_load_img(interpreter, args):
+    check_main_thread(interpreter, "LoadImage")
+    return vm.load_image(args[0])
+
+def sys_load_sheet(interpreter, args):
+    check_main_thread(interpreter, "LoadSheet")
+    return vm.load_sheet(args[0], args[1], args[2])
+
+def sys_draw_img(interpreter, args):
+    # DrawImage(image, x, y [, scale]) or DrawImage(sheet, frame, x, y [, scale])
+    check_main_thread(interpreter, "DrawImage")
+    if isinstance(args[0], SpriteSheet):
+        sheet = args[0]
+        vm.draw_image(sheet.path, args[2], args[3], sheet.frame_rect(args[1]), args[4] if len(args) > 4 else 1)
+    else:
+        vm.draw_image(args[0], args[1], args[2], None, args[3] if len(args) > 3 else 1)
+    return None
+
+def sys_image_stats(interpreter, args): return vm.image_cache.stats()
+def sys_image_cache_limit(interpreter, args): vm.image_cache.resize(int(args[0])); return None
+
+def sys_key_pressed(interpreter, args): 
+    key = str(args[0]).lower()
+    return 1 if key in vm.keys_down else 0
+
+def sys_mouse_x(interpreter, args): return vm.mouse_x
+def sys_mouse_y(interpreter, args): return vm.mouse_y
+def sys_mouse_down(interpreter, args): return 1 if vm.mouse_down else 0
+def sys_start(interpreter, args):
+    check_main_thread(interpreter, "GameLoop")
+    vm.start_loop(interpreter, args[0])
+    return None
+
+BUILTINS = {
+    "InitWindow": sys_init,
+    "Rect": sys_draw_rect,
+    "Text": sys_draw_text,
+    "LoadImage": sys_load_img,
+    "DrawImage": sys_draw_img,
+    "LoadSheet": sys_load_sheet,
+    "ImageStats": sys_image_stats,
+    "ImageCacheLimit": sys_image_cache_limit,
+    "KeyDown": sys_key_pressed,
+    "MouseX": sys_mouse_x,
+    "MouseY": sys_mouse_y,
+    "MouseDown": sys_mouse_down,
+    "GameLoop": sys_start,
+}
@@ -0,0 +1,83 @@
+import collections
+import struct
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+class ImageCache:
+    # LRU over decoded images, bounded by their decoded size in bytes rather
+    # than by entry count, so one huge atlas cannot pin hundreds of sprites.
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, make):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        image, size = make()
+        self.entries[key] = (image, size)
+        self.bytes += size
+        self.evict()
+        return image
+
+    def evict(self):
+        # The newest entry is always kept, even if it alone exceeds the limit.
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
+
+def image_size(path):
+    # Width and height from the file header, for the formats Tk reads (PNG,
+    # GIF, PPM/PGM), without decoding the pixels or needing a window.
+    with open(path, 'rb') as f: head = f.read(512)
+    if head[:8] == b"\x89PNG\r\n\x1a\n": return struct.unpack(">II", head[16:24])
+    if head[:6] in (b"GIF87a", b"GIF89a"): return struct.unpack("<HH", head[6:10])
+    if head[:1] == b"P" and head[1:2] in b"3456":
+        fields = []
+        for line in head[2:].split(b"\n"):
+            fields += line.split(b"#")[0].split()
+            if len(fields) >= 2: return int(fields[0]), int(fields[1])
+    raise Exception(f"Cannot read the size of '{path}': not a PNG, GIF or PPM image")
+
+class SpriteSheet:
+    def __init__(self, path, frame_w, frame_h, width, height):
+        if frame_w <= 0 or frame_h <= 0: raise Exception("Sprite frames must have a positive size")
+        self.path = path
+        self.frame_w = frame_w
+        self.frame_h = frame_h
+        self.columns = max(1, width // frame_w)
+        self.count = self.columns * max(1, height // frame_h)
+
+    def frame_rect(self, frame):
+        frame = int(frame)
+        if not 0 <= frame < self.count: raise Exception(f"Frame {frame} out of range for {self}")
+        x = (frame % self.columns) * self.frame_w
+        y = (frame // self.columns) * self.frame_h
+        return (x, y, x + self.frame_w, y + self.frame_h)
+
+    def __len__(self): return self.count
+    def __repr__(self): return f"<sheet {self.path} {self.frame_w}x{self.frame_h} frames={self.count}>"
@@ -0,0 +1,103 @@
+import atexit
+
+def read_text(path):
+    with open(path, 'r') as f: return f.read()
+
+def write_text(path, text):
+    with open(path, 'w') as f: f.write(text)
+
+def run_blocking(interpreter, func, *args):
+    # Inside a spawned task the call runs on the scheduler's thread pool so
+    # other tasks keep going; elsewhere it simply blocks.
+    scheduler = interpreter.scheduler
+    if scheduler and scheduler.current: return scheduler.offload(func, *args)
+    return func(*args)
+
+def io_read(interpreter, args):
+    try: return run_blocking(interpreter, read_text, args[0])
+    except OSError as e: raise Exception(f"Cannot read file '{args[0]}': {e.strerror}")
+
+def io_write(interpreter, args):
+    try: run_blocking(interpreter, write_text, args[0], str(args[1]))
+    except OSError as e: raise Exception(f"Cannot write file '{args[0]}': {e.strerror}")
+    return None
+
+IO_BUFFER_SIZE = 64 * 1024
+open_handles = set()
+
+class FileHandle:
+    def __init__(self, path, mode):
+        if mode not in ('r', 'w', 'a'): raise Exception(f"Invalid file mode '{mode}'")
+        try:
+            self.file = open(path, mode, buffering=IO_BUFFER_SIZE)
+        except OSError as e:
+            raise Exception(f"Cannot open file '{path}': {e.strerror}")
+        self.path = path
+        self.mode = mode
+        open_handles.add(self)
+
+    def close(self):
+        if not self.file.closed: self.file.close()
+        open_handles.discard(self)
+
+    def __reduce__(self): raise Exception(f"Cannot snapshot open file {self}")
+
+    def __repr__(self):
+        state = "closed" if self.file.closed else self.mode
+        return f"<file {self.path} ({state})>"
+
+class LineIterator:
+    # Lazily yields lines without their trailing newline, so a for loop over
+    # a huge file only ever holds one line in memory. Unlike ReadLine, the
+    # loop itself signals the end of the file, so the newline is not needed.
+    def __init__(self, handle, owned=False):
+        self.handle = handle
+        self.owned = owned
+    def __iter__(self): return self
+    def __next__(self):
+        line = self.handle.file.readline() if not self.handle.file.closed else ""
+        if not line:
+            if self.owned: self.handle.close()
+            raise StopIteration
+        return line[:-1] if line.endswith("\n") else line
+    def release(self):
+        # Called when a for loop leaves early (return or error); a handle
+        # opened by Lines(path) is closed then rather than at exit.
+        if self.owned: self.handle.close()
+    def __reduce__(self): raise Exception(f"Cannot snapshot open file {self}")
+    def __repr__(self): return f"<lines {self.handle.path}>"
+
+@atexit.register
+def close_open_handles():
+    for handle in list(open_handles): handle.close()
+
+def get_handle(args, name):
+    handle = args[0] if args else None
+    if not isinstance(handle, FileHandle): raise Exception(f"{name} expects a file handle, got {handle}")
+    if handle.file.closed: raise Exception(f"{name}: file '{handle.path}' is closed")
+    return handle
+
+def io_open(interpreter, args): return FileHandle(args[0], args[1] if len(args) > 1 else 'r')
+# ReadLine keeps the trailing newline so that an empty line ("\n") can be told
+# apart from the end of the file (""); Lines strips it.
+def io_read_line(interpreter, args): return get_handle(args, "ReadLine").file.readline()
+def io_write_handle(interpreter, args): get_handle(args, "Write").file.write(str(args[1])); return None
+def io_flush(interpreter, args): get_handle(args, "Flush").file.flush(); return None
+def io_close(interpreter, args):
+    if isinstance(args[0], FileHandle): args[0].close()
+    return None
+
+def io_lines(interpreter, args):
+    if isinstance(args[0], str): return LineIterator(FileHandle(args[0], 'r'), owned=True)
+    return LineIterator(get_handle(args, "Lines"))
+
+BUILTINS = {
+    "ReadFile": io_read,
+    "WriteFile": io_write,
+    "Open": io_open,
+    "ReadLine": io_read_line,
+    "Lines": io_lines,
+    "Write": io_write_handle,
+    "Flush": io_flush,
+    "Close": io_close,
+}
@@ -0,0 +1,14 @@
+import math
+import random
+
+def math_random(interpreter, args): return random.randint(int(args[0]), int(args[1]))
+def math_sin(interpreter, args): return math.sin(args[0])
+def math_cos(interpreter, args): return math.cos(args[0])
+def math_floor(interpreter, args): return math.floor(args[0])
+
+BUILTINS = {
+    "Random": math_random,
+    "Sin": math_sin,
+    "Cos": math_cos,
+    "Floor": math_floor,
+}
@@ -0,0 +1,61 @@
+import json
+import random
+
+FORMAT = "gemstone-input"
+VERSION = 1
+
+# Recordings are line based: a JSON header, then one line per frame holding
+# only the input fields that changed since the previous frame (an empty line
+# when nothing changed).
+#   k: sorted list of held keys   m: [mouse_x, mouse_y]   b: mouse button 0/1
+
+def input_state(vm):
+    return sorted(vm.keys_down), [vm.mouse_x, vm.mouse_y], 1 if vm.mouse_down else 0
+
+class InputRecorder:
+    def __init__(self, path, seed=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        random.seed(self.seed)
+        self.file = open(path, 'w')
+        self.file.write(json.dumps({"format": FORMAT, "version": VERSION, "seed": self.seed}) + "\n")
+        self.last = ([], [0, 0], 0)
+        self.frames = 0
+
+    def record(self, vm):
+        state = input_state(vm)
+        delta = {field: new for field, old, new in zip("kmb", self.last, state) if old != new}
+        self.file.write(json.dumps(delta, separators=(",", ":")) + "\n" if delta else "\n")
+        self.last = state
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed: self.file.close()
+
+class InputPlayer:
+    def __init__(self, path):
+        try:
+            with open(path) as f: lines = f.read().split("\n")
+        except OSError as e:
+            raise Exception(f"Cannot read input recording '{path}': {e.strerror}")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = {}
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise Exception(f"'{path}' is not a Gemstone input recording")
+        self.seed = header["seed"]
+        random.seed(self.seed)
+        if lines[-1] == "": lines.pop()
+        self.frames = [json.loads(line) if line else None for line in lines[1:]]
+        self.position = 0
+
+    def apply(self, vm):
+        # Returns False once the recording is exhausted.
+        if self.position >= len(self.frames): return False
+        delta = self.frames[self.position]
+        self.position += 1
+        if delta:
+            if "k" in delta: vm.keys_down = set(delta["k"])
+            if "m" in delta: vm.mouse_x, vm.mouse_y = delta["m"]
+            if "b" in delta: vm.mouse_down = bool(delta["b"])
+        return True
@@ -0,0 +1,88 @@
+class SpatialGrid:
+    # Uniform spatial hash over dicts with x/y fields. Entries are keyed by
+    # identity because Gemstone dicts are mutable (and unhashable).
+    def __init__(self, cell_size):
+        if cell_size <= 0: raise Exception("Grid cell size must be positive")
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+
+    def cell_of(self, obj):
+        try: x, y = obj['x'], obj['y']
+        except (KeyError, TypeError): raise Exception(f"Grid entries need x and y fields, got {obj}")
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, obj):
+        key = id(obj)
+        if key in self.entries: return self.move(obj)
+        cell = self.cell_of(obj)
+        self.cells.setdefault(cell, {})[key] = obj
+        self.entries[key] = cell
+
+    def move(self, obj):
+        key = id(obj)
+        old = self.entries.get(key)
+        if old is None: return self.insert(obj)
+        cell = self.cell_of(obj)
+        if cell == old: return
+        bucket = self.cells[old]
+        del bucket[key]
+        if not bucket: del self.cells[old]
+        self.cells.setdefault(cell, {})[key] = obj
+        self.entries[key] = cell
+
+    def remove(self, obj):
+        cell = self.entries.pop(id(obj), None)
+        if cell is None: return
+        bucket = self.cells[cell]
+        del bucket[id(obj)]
+        if not bucket: del self.cells[cell]
+
+    def buckets_in(self, x0, y0, x1, y1):
+        cs = self.cell_size
+        cx0, cy0, cx1, cy1 = int(x0 // cs), int(y0 // cs), int(x1 // cs), int(y1 // cs)
+        # Huge query areas are cheaper to answer from the occupied cells.
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            return [b for (cx, cy), b in self.cells.items() if cx0 <= cx <= cx1 and cy0 <= cy <= cy1]
+        cells = self.cells
+        return [cells[(cx, cy)] for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1) if (cx, cy) in cells]
+
+    def query_rect(self, x, y, w, h):
+        x1, y1 = x + w, y + h
+        return [obj for bucket in self.buckets_in(x, y, x1, y1) for obj in bucket.values()
+                if x <= obj['x'] <= x1 and y <= obj['y'] <= y1]
+
+    def query_radius(self, x, y, r):
+        r2 = r * r
+        return [obj for bucket in self.buckets_in(x - r, y - r, x + r, y + r) for obj in bucket.values()
+                if (obj['x'] - x) ** 2 + (obj['y'] - y) ** 2 <= r2]
+
+    def __setstate__(self, state):
+        # Entries are keyed by id(), which does not survive a snapshot.
+        self.__dict__.update(state)
+        self.cells = {cell: {id(obj): obj for obj in bucket.values()} for cell, bucket in self.cells.items()}
+        self.entries = {key: cell for cell, bucket in self.cells.items() for key in bucket}
+
+    def __len__(self): return len(self.entries)
+    def __repr__(self): return f"<grid cell={self.cell_size} entries={len(self.entries)}>"
+
+def get_grid(args, name):
+    grid = args[0] if args else None
+    if not isinstance(grid, SpatialGrid): raise Exception(f"{name} expects a grid, got {grid}")
+    return grid
+
+def grid_new(interpreter, args): return SpatialGrid(args[0] if args else 64)
+def grid_insert(interpreter, args): get_grid(args, "GridInsert").insert(args[1]); return None
+def grid_move(interpreter, args): get_grid(args, "GridMove").move(args[1]); return None
+def grid_remove(interpreter, args): get_grid(args, "GridRemove").remove(args[1]); return None
+def grid_query_rect(interpreter, args): return get_grid(args, "GridQueryRect").query_rect(*args[1:5])
+def grid_query_radius(interpreter, args): return get_grid(args, "GridQueryRadius").query_radius(*args[1:4])
+
+BUILTINS = {
+    "Grid": grid_new,
+    "GridInsert": grid_insert,
+    "GridMove": grid_move,
+    "GridRemove": grid_remove,
+    "GridQueryRect": grid_query_rect,
+    "GridQueryRadius": grid_query_radius,
+}
@@ -0,0 +1,204 @@
+import asyncio
+import threading
+from .core import check_callable
+
+class TaskCancelled(Exception): pass
+
+class Task:
+    def __init__(self, function, args, scope):
+        self.function = function
+        self.args = args
+        self.scope = scope
+        self.future = None
+        self.thread = None
+        self.resume = threading.Semaphore(0)
+        self.suspended = threading.Semaphore(0)
+        self.request = None
+        self.send = None
+        self.throw = None
+        self.done = False
+        self.result = None
+        self.error = None
+        self.observed = False
+
+    def __reduce__(self): raise Exception(f"Cannot snapshot {self}")
+
+    def __repr__(self):
+        state = "done" if self.done else "running" if self.thread else "pending"
+        return f"<task {getattr(self.function, 'name', self.function)} ({state})>"
+
+class Channel:
+    # FIFO between tasks. Capacity 0 (the default) means unbounded, as for
+    # asyncio.Queue: send never blocks and only receive can wait. A positive
+    # capacity makes send wait while the channel is full.
+    def __init__(self, capacity=0):
+        if capacity < 0: raise Exception("Channel capacity cannot be negative")
+        self.queue = asyncio.Queue(capacity)
+
+    def __reduce__(self): raise Exception(f"Cannot snapshot {self}")
+    def __repr__(self): return f"<channel {self.queue.qsize()} queued>"
+
+class Scheduler:
+    # Runs Gemstone tasks on an asyncio event loop. The interpreter is a
+    # recursive tree walker, so every task gets its own thread (and Python
+    # stack), but only one of them ever runs: the loop resumes a task and
+    # blocks until it finishes or suspends on an awaitable, which the loop
+    # then awaits on its behalf. Interpreter scope is swapped at each switch.
+    # Code that must stay on the main thread (Tk drawing) checks current.
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.loop = asyncio.new_event_loop()
+        self.tasks = []
+        self.current = None
+
+    def spawn(self, function, args):
+        interpreter = self.interpreter
+        task = Task(function, args, (interpreter.current_symbol_table, interpreter.module_table))
+        # Safe from a task thread too: the loop's thread is blocked in
+        # switch_to for as long as a task runs.
+        task.future = self.loop.create_task(self.drive(task))
+        self.tasks.append(task)
+        return task
+
+    async def drive(self, task):
+        task.thread = threading.Thread(target=self.task_main, args=(task,), daemon=True)
+        task.thread.start()
+        send = throw = None
+        while True:
+            request = self.switch_to(task, send, throw)
+            if task.done: break
+            send = throw = None
+            try:
+                send = await request()
+            except asyncio.CancelledError:
+                throw = TaskCancelled(f"{task} was cancelled")
+            except Exception as e:
+                throw = e
+        if task.error: raise task.error
+        return task.result
+
+    def task_main(self, task):
+        task.resume.acquire()
+        try:
+            task.result = self.interpreter.call_value(task.function, task.args)
+        except BaseException as e:
+            task.error = e
+        finally:
+            task.done = True
+            task.suspended.release()
+
+    def switch_to(self, task, send, throw):
+        interpreter = self.interpreter
+        saved = (interpreter.current_symbol_table, interpreter.module_table)
+        interpreter.current_symbol_table, interpreter.module_table = task.scope
+        previous, self.current = self.current, task
+        task.send, task.throw = send, throw
+        task.resume.release()
+        task.suspended.acquire()
+        task.scope = (interpreter.current_symbol_table, interpreter.module_table)
+        interpreter.current_symbol_table, interpreter.module_table = saved
+        self.current = previous
+        return task.request
+
+    def wait(self, factory):
+        # Blocks the calling Gemstone code until factory()'s awaitable is
+        # done, letting other tasks run meanwhile. Inside a task this hands
+        # the awaitable to the loop; outside one it runs the loop itself.
+        task = self.current
+        if task is None: return self.loop.run_until_complete(factory())
+        task.request = factory
+        task.suspended.release()
+        task.resume.acquire()
+        if task.throw: raise task.throw
+        return task.send
+
+    def offload(self, func, *args):
+        return self.wait(lambda: self.loop.run_in_executor(None, func, *args))
+
+    def join(self, task):
+        task.observed = True
+        return self.wait(lambda: asyncio.shield(task.future))
+
+    def cancel(self, task):
+        return task.future.cancel()
+
+    def idle(self):
+        return all(task.future.done() for task in self.tasks)
+
+    def run_ready(self):
+        # One pass of the event loop: tasks whose waits are over advance to
+        # their next suspension point. Called between GameLoop frames.
+        if self.current is not None or self.loop.is_running(): return
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+    def drain(self):
+        # Runs until every spawned task (including ones spawned meanwhile)
+        # has finished, then reports failures nobody awaited.
+        while True:
+            pending = [task.future for task in self.tasks if not task.future.done()]
+            if not pending: break
+            self.loop.run_until_complete(asyncio.wait(pending))
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            error = task.future.exception() if not task.future.cancelled() else None
+            if error and not task.observed and not isinstance(error, TaskCancelled):
+                raise Exception(f"Error in {task}: {error}")
+
+def get_scheduler(interpreter):
+    if interpreter.scheduler is None: interpreter.scheduler = Scheduler(interpreter)
+    return interpreter.scheduler
+
+def get_task(args, name):
+    task = args[0] if args else None
+    if not isinstance(task, Task): raise Exception(f"{name} expects a task, got {task}")
+    return task
+
+def get_channel(args, name):
+    channel = args[0] if args else None
+    if not isinstance(channel, Channel): raise Exception(f"{name} expects a channel, got {channel}")
+    return channel
+
+def task_spawn(interpreter, args):
+    if not args: raise Exception("spawn expects a function")
+    return get_scheduler(interpreter).spawn(check_callable(args[0], "spawn"), args[1:])
+
+def task_await(interpreter, args):
+    return get_scheduler(interpreter).join(get_task(args, "await"))
+
+def task_cancel(interpreter, args):
+    return 1 if get_scheduler(interpreter).cancel(get_task(args, "cancel")) else 0
+
+def task_sleep(interpreter, args):
+    seconds = args[0] if args else 0
+    if not isinstance(seconds, (int, float)) or seconds < 0: raise Exception(f"sleep expects a non-negative number, got {seconds}")
+    get_scheduler(interpreter).wait(lambda: asyncio.sleep(seconds))
+    return None
+
+def task_channel(interpreter, args):
+    return Channel(args[0] if args else 0)
+
+def task_send(interpreter, args):
+    channel = get_channel(args, "send")
+    scheduler = get_scheduler(interpreter)
+    if channel.queue.full() and scheduler.current is None and scheduler.idle():
+        raise Exception("send would block forever: channel is full and no task is running")
+    scheduler.wait(lambda: channel.queue.put(args[1]))
+    return None
+
+def task_receive(interpreter, args):
+    channel = get_channel(args, "receive")
+    scheduler = get_scheduler(interpreter)
+    if channel.queue.empty() and scheduler.current is None and scheduler.idle():
+        raise Exception("receive would block forever: channel is empty and no task is running")
+    return scheduler.wait(channel.queue.get)
+
+BUILTINS = {
+    "spawn": task_spawn,
+    "await": task_await,
+    "cancel": task_cancel,
+    "sleep": task_sleep,
+    "Channel": task_channel,
+    "send": task_send,
+    "receive": task_receive,
+}
@@ -29,13 +29,14 @@ TOK_EOF = 'EOF'
 
 KEYWORDS = [
     'mem', 'emit', 'if', 'then', 'else', 'while', 'for', 'in', 
-    'do', 'end', 'def', 'return'
+    'do', 'end', 'def', 'return', 'import', 'as', 'yield'
 ]
 
 class Token:
-    def __init__(self, type_, value=None):
+    def __init__(self, type_, value=None, line=None):
         self.type = type_
         self.value = value
+        self.line = line
 
     def __repr__(self):
         if self.value: return f'{self.type}:{self.value}'
@@ -48,9 +49,11 @@ class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
+        self.line = 1
         self.current_char = self.text[self.pos] if self.text else None
 
     def advance(self):
+        if self.current_char == '\n': self.line += 1
         self.pos += 1
         if self.pos < len(self.text):
             self.current_char = self.text[self.pos]
@@ -137,6 +140,11 @@ class Lexer:
         return Token(token_type)
 
     def get_next_token(self):
+        token = self.scan_token()
+        token.line = self.token_line
+        return token
+
+    def scan_token(self):
         while self.current_char is not None:
             if self.current_char.isspace():
                 self.skip_whitespace()
@@ -144,6 +152,7 @@ class Lexer:
             if self.current_char == '#':
                 self.skip_comment()
                 continue
+            self.token_line = self.line
             if self.current_char.isdigit():
                 return self.make_number()
             if self.current_char == '"':
@@ -202,4 +211,5 @@ class Lexer:
 
             raise Exception(f'Illegal character: {self.current_char}')
 
+        self.token_line = self.line
         return Token(TOK_EOF)
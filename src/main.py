@@ -1,10 +1,20 @@
+import argparse
+import os
+import random
 import sys
 from lexer.lexer import Lexer, TOK_EOF
 from parser.parser import Parser
+from parser.pratt import PrattParser
 from interpreter.interpreter import Interpreter
 from interpreter.stdlib import load_stdlib
 
-def run(text, interpreter, is_file=False):
+# Tooling modules (profiler, JIT, images) are imported only when their flag
+# is given, and the module loader only on the first import statement, keeping
+# plain runs and the REPL quick to start.
+
+PARSERS = {"pratt": PrattParser, "classic": Parser}
+
+def run(text, interpreter, is_file=False, parser_class=PrattParser):
     lexer = Lexer(text)
     tokens = []
     try:
@@ -19,7 +29,7 @@ def run(text, interpreter, is_file=False):
 
     if not tokens: return
 
-    parser = Parser(tokens)
+    parser = parser_class(tokens)
     try:
         nodes = parser.parse()
     except Exception as e:
@@ -31,19 +41,109 @@ def run(text, interpreter, is_file=False):
             result = interpreter.visit(node)
             if not is_file and result is not None:
                 print(result)
+        # Spawned tasks run to completion before the script (or REPL line) ends.
+        if interpreter.scheduler: interpreter.scheduler.drain()
     except Exception as e:
         print(f"Runtime Error: {e}")
 
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(prog="gemstone", description="Gemstone interpreter")
+    arg_parser.add_argument("script", nargs="?", help="script to run (starts the REPL when omitted)")
+    arg_parser.add_argument("--mem-report", nargs="?", const="mem_report.json", metavar="PATH",
+                            help="count allocations and sample memory per frame; write a JSON summary to PATH")
+    arg_parser.add_argument("--jit", action="store_true", help="compile hot while/for loops")
+    arg_parser.add_argument("--jit-threshold", type=int, default=100, metavar="N",
+                            help="iterations before a loop is compiled (default: 100)")
+    arg_parser.add_argument("--jit-stats", action="store_true", help="report compiled loops, type variants and entry misses on exit (implies --jit)")
+    arg_parser.add_argument("--image", metavar="PATH", help="restore globals and functions from an image before running")
+    arg_parser.add_argument("--save-image", metavar="PATH", help="snapshot globals and functions to an image after running")
+    arg_parser.add_argument("--backend", choices=("tk", "framebuffer"), default="tk",
+                            help="render to a Tk window or to an in-memory framebuffer (needs numpy)")
+    arg_parser.add_argument("--frames", type=int, metavar="N", help="stop GameLoop after N frames")
+    arg_parser.add_argument("--dump-frames", metavar="DIR", help="write every framebuffer frame to DIR")
+    arg_parser.add_argument("--frame-format", choices=("png", "ppm"), default="png", help="image format for --dump-frames")
+    arg_parser.add_argument("--record", metavar="FILE", help="record per-frame keyboard/mouse input and the Random seed to FILE")
+    arg_parser.add_argument("--replay", metavar="FILE", help="replay input recorded with --record instead of live input")
+    arg_parser.add_argument("--seed", type=int, help="seed for Random (saved in the recording with --record)")
+    arg_parser.add_argument("--path", action="append", default=[], metavar="DIR",
+                            help="add DIR to the module search path (also read from GEMPATH)")
+    arg_parser.add_argument("--timing", action="store_true", help="report per-module load times on exit")
+    arg_parser.add_argument("--parser", choices=tuple(PARSERS), default="pratt",
+                            help="expression parser implementation (default: pratt)")
+    options = arg_parser.parse_args(argv)
+    if options.seed is not None and options.replay:
+        arg_parser.error("--seed cannot be used with --replay; recordings carry their own seed")
+    return options
+
+def configure_vm(options):
+    if options.backend != "framebuffer" and not options.record and not options.replay and options.frames is None: return True
+    from interpreter.stdlib import graphics
+    vm = graphics.vm
+    try:
+        if options.backend == "framebuffer":
+            from interpreter.stdlib.framebuffer import FramebufferRenderer
+            vm.renderer = FramebufferRenderer(vm.width, vm.height, options.dump_frames, options.frame_format)
+        if options.replay:
+            from interpreter.stdlib.replay import InputPlayer
+            vm.player = InputPlayer(options.replay)
+        elif options.record:
+            from interpreter.stdlib.replay import InputRecorder
+            vm.recorder = InputRecorder(options.record, options.seed)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    if options.frames is not None: vm.max_frames = options.frames
+    elif vm.renderer and not vm.player: vm.max_frames = 300
+    return True
+
 def main():
+    options = parse_args(sys.argv[1:])
     interpreter = Interpreter()
     load_stdlib(interpreter.global_symbol_table)
-    
-    if len(sys.argv) > 1:
-        filename = sys.argv[1]
+    interpreter.module_path = [os.path.abspath(p) for p in options.path]
+    interpreter.main_path = options.script
+
+    if options.mem_report:
+        from interpreter.memprofile import MemoryProfiler
+        interpreter.profiler = MemoryProfiler(interpreter)
+        interpreter.profiler.start()
+    if options.seed is not None: random.seed(options.seed)
+    if not configure_vm(options): return
+    if options.jit or options.jit_stats:
+        from interpreter.jit import TracingJit
+        interpreter.jit = TracingJit(options.jit_threshold)
+    try:
+        start(options, interpreter)
+    finally:
+        if options.mem_report:
+            summary = interpreter.profiler.summary()
+            interpreter.profiler.stop()
+            interpreter.profiler.write_json(options.mem_report, summary)
+            print(interpreter.profiler.format_table(summary))
+            print(f"Memory report written to {options.mem_report}")
+        if options.jit_stats:
+            print(interpreter.jit.format_report())
+        if options.timing:
+            print(interpreter.modules.format_report() if interpreter.modules else "No modules were imported")
+        if options.record:
+            from interpreter.stdlib import graphics
+            if graphics.vm.recorder: graphics.vm.recorder.close()
+
+def start(options, interpreter):
+    if options.image:
+        from interpreter.snapshot import load_image
+        try:
+            load_image(interpreter, options.image)
+        except Exception as e:
+            print(f"Image Error: {e}")
+            return
+
+    if options.script:
+        filename = options.script
         try:
             with open(filename, 'r') as f:
                 script = f.read()
-            run(script, interpreter, is_file=True)
+            run(script, interpreter, is_file=True, parser_class=PARSERS[options.parser])
         except FileNotFoundError:
             print(f"Could not find file: {filename}")
     else:
@@ -57,7 +157,14 @@ def main():
             if not text or text.lower() == 'exit':
                 break
             
-            run(text, interpreter, is_file=False)
+            run(text, interpreter, is_file=False, parser_class=PARSERS[options.parser])
+
+    if options.save_image:
+        from interpreter.snapshot import save_image
+        try:
+            save_image(interpreter, options.save_image)
+        except Exception as e:
+            print(f"Image Error: {e}")
 
 if __name__ == '__main__':
     main()
@@ -9,13 +9,15 @@ class StringNode:
     def __repr__(self): return f'{self.token}'
 
 class ListNode:
-    def __init__(self, element_nodes):
+    def __init__(self, element_nodes, line=None):
         self.element_nodes = element_nodes
+        self.line = line
     def __repr__(self): return f'[{self.element_nodes}]'
 
 class DictNode:
-    def __init__(self, key_value_pairs):
+    def __init__(self, key_value_pairs, line=None):
         self.key_value_pairs = key_value_pairs
+        self.line = line
     def __repr__(self): return f'{{{self.key_value_pairs}}}'
 
 class BinOpNode:
@@ -49,6 +51,12 @@ class IndexAccessNode:
         self.index_node = index_node
     def __repr__(self): return f'{self.left_node}[{self.index_node}]'
 
+class SliceNode:
+    def __init__(self, start_node, end_node):
+        self.start_node = start_node
+        self.end_node = end_node
+    def __repr__(self): return f'{self.start_node}:{self.end_node}'
+
 class MemberAccessNode:
     def __init__(self, left_node, member_name_token):
         self.left_node = left_node
@@ -61,29 +69,35 @@ class EmitNode:
     def __repr__(self): return f'(emit {self.node_to_print})'
 
 class IfNode:
-    def __init__(self, cases, else_case):
+    def __init__(self, cases, else_case, has_yield=False):
         self.cases = cases
         self.else_case = else_case
+        self.has_yield = has_yield
     def __repr__(self): return f'(if {self.cases} else {self.else_case})'
 
 class WhileNode:
-    def __init__(self, condition_node, body_nodes):
+    def __init__(self, condition_node, body_nodes, line=None, has_yield=False):
         self.condition_node = condition_node
         self.body_nodes = body_nodes
+        self.line = line
+        self.has_yield = has_yield
     def __repr__(self): return f'(while {self.condition_node} do {self.body_nodes})'
 
 class ForNode:
-    def __init__(self, var_name_token, iterator_node, body_nodes):
+    def __init__(self, var_name_token, iterator_node, body_nodes, line=None, has_yield=False):
         self.var_name_token = var_name_token
         self.iterator_node = iterator_node
         self.body_nodes = body_nodes
+        self.line = line
+        self.has_yield = has_yield
     def __repr__(self): return f'(for {self.var_name_token} in {self.iterator_node} do {self.body_nodes})'
 
 class FuncDefNode:
-    def __init__(self, var_name_token, arg_tokens, body_nodes):
+    def __init__(self, var_name_token, arg_tokens, body_nodes, is_generator=False):
         self.var_name_token = var_name_token
         self.arg_tokens = arg_tokens
         self.body_nodes = body_nodes
+        self.is_generator = is_generator
     def __repr__(self): return f'(def {self.var_name_token}({self.arg_tokens}))'
 
 class FuncCallNode:
@@ -92,7 +106,18 @@ class FuncCallNode:
         self.arg_nodes = arg_nodes
     def __repr__(self): return f'(call {self.node_to_call} args={self.arg_nodes})'
 
+class YieldNode:
+    def __init__(self, node_to_yield):
+        self.node_to_yield = node_to_yield
+    def __repr__(self): return f'(yield {self.node_to_yield})'
+
 class ReturnNode:
     def __init__(self, node_to_return):
         self.node_to_return = node_to_return
     def __repr__(self): return f'(return {self.node_to_return})'
+
+class ImportNode:
+    def __init__(self, path_token, alias_token=None):
+        self.path_token = path_token
+        self.alias_token = alias_token
+    def __repr__(self): return f'(import {self.path_token} as {self.alias_token})'
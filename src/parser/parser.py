@@ -5,6 +5,9 @@ class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
         self.token_idx = -1
+        # Yield statements seen so far in the current def body; control flow
+        # records whether its block contains one.
+        self.yields = 0
         self.advance()
 
     def advance(self):
@@ -53,6 +56,7 @@ class Parser:
         raise Exception(f"Unexpected token: {token}")
 
     def list_expr(self):
+        line = self.current_token.line
         self.advance()
         elements = []
         if self.current_token.type == TOK_RBRACKET:
@@ -65,9 +69,10 @@ class Parser:
             if self.current_token.type != TOK_RBRACKET:
                 raise Exception("Expected ']'")
             self.advance()
-        return ListNode(elements)
+        return ListNode(elements, line)
 
     def dict_expr(self):
+        line = self.current_token.line
         self.advance()
         pairs = []
         if self.current_token.type == TOK_RBRACE:
@@ -92,7 +97,7 @@ class Parser:
             if self.current_token.type != TOK_RBRACE:
                 raise Exception("Expected '}'")
             self.advance()
-        return DictNode(pairs)
+        return DictNode(pairs, line)
 
     def call(self):
         node = self.atom()
@@ -114,12 +119,7 @@ class Parser:
                 node = FuncCallNode(node, arg_nodes)
             
             elif self.current_token.type == TOK_LBRACKET:
-                self.advance()
-                index = self.expr()
-                if self.current_token.type != TOK_RBRACKET:
-                    raise Exception("Expected ']'")
-                self.advance()
-                node = IndexAccessNode(node, index)
+                node = IndexAccessNode(node, self.index())
 
             elif self.current_token.type == TOK_DOT:
                 self.advance()
@@ -134,6 +134,19 @@ class Parser:
         
         return node
 
+    def index(self):
+        # [i], or a slice [i:j] with either bound optional
+        self.advance()
+        index = None if self.current_token.type == TOK_COLON else self.expr()
+        if self.current_token.type == TOK_COLON:
+            self.advance()
+            end = None if self.current_token.type == TOK_RBRACKET else self.expr()
+            index = SliceNode(index, end)
+        if self.current_token.type != TOK_RBRACKET:
+            raise Exception("Expected ']'")
+        self.advance()
+        return index
+
     def factor(self):
         token = self.current_token
         if token.type in (TOK_PLUS, TOK_MINUS):
@@ -159,6 +172,10 @@ class Parser:
             return self.func_def()
         if self.current_token.matches(TOK_KEYWORD, 'return'):
             return self.return_expr()
+        if self.current_token.matches(TOK_KEYWORD, 'import'):
+            return self.import_expr()
+        if self.current_token.matches(TOK_KEYWORD, 'yield'):
+            return self.yield_expr()
             
         node = self.bin_op(self.arith_expr, (TOK_EE, TOK_NE, TOK_LT, TOK_GT, TOK_LTE, TOK_GTE))
         return node
@@ -174,11 +191,7 @@ class Parser:
             # Allow modifiers (.x or [i])
             while self.current_token.type in (TOK_DOT, TOK_LBRACKET):
                 if self.current_token.type == TOK_LBRACKET:
-                    self.advance()
-                    index = self.expr()
-                    if self.current_token.type != TOK_RBRACKET: raise Exception("Expected ']'")
-                    self.advance()
-                    target = IndexAccessNode(target, index)
+                    target = IndexAccessNode(target, self.index())
                 elif self.current_token.type == TOK_DOT:
                     self.advance()
                     if self.current_token.type != TOK_IDENTIFIER: raise Exception("Expected identifier")
@@ -207,6 +220,7 @@ class Parser:
         return statements
 
     def if_expr(self):
+        yields = self.yields
         self.advance()
         condition = self.comp_expr()
         if not self.check_keyword('then'): raise Exception("Expected 'then'")
@@ -218,9 +232,11 @@ class Parser:
             else_block = self.block()
         if not self.check_keyword('end'): raise Exception("Expected 'end'")
         self.advance()
-        return IfNode([(condition, true_block)], else_block)
+        return IfNode([(condition, true_block)], else_block, self.yields > yields)
 
     def while_expr(self):
+        line = self.current_token.line
+        yields = self.yields
         self.advance()
         condition = self.comp_expr()
         if not self.check_keyword('do'): raise Exception("Expected 'do'")
@@ -228,9 +244,11 @@ class Parser:
         body = self.block()
         if not self.check_keyword('end'): raise Exception("Expected 'end'")
         self.advance()
-        return WhileNode(condition, body)
+        return WhileNode(condition, body, line, self.yields > yields)
 
     def for_expr(self):
+        line = self.current_token.line
+        yields = self.yields
         self.advance()
         if self.current_token.type != TOK_IDENTIFIER: raise Exception("Expected iter var")
         var_name = self.current_token
@@ -243,7 +261,7 @@ class Parser:
         body = self.block()
         if not self.check_keyword('end'): raise Exception("Expected 'end'")
         self.advance()
-        return ForNode(var_name, iterator, body)
+        return ForNode(var_name, iterator, body, line, self.yields > yields)
 
     def func_def(self):
         self.advance()
@@ -263,16 +281,38 @@ class Parser:
                 self.advance()
         if self.current_token.type != TOK_RPAREN: raise Exception("Expected ')'")
         self.advance()
+        outer_yields, self.yields = self.yields, 0
         body = self.block()
+        is_generator = self.yields > 0
+        self.yields = outer_yields
         if not self.check_keyword('end'): raise Exception("Expected 'end'")
         self.advance()
-        return FuncDefNode(var_name_token, arg_tokens, body)
+        return FuncDefNode(var_name_token, arg_tokens, body, is_generator)
     
     def return_expr(self):
         self.advance()
         expr = self.expr()
         return ReturnNode(expr)
 
+    def yield_expr(self):
+        self.advance()
+        expr = self.expr()
+        self.yields += 1
+        return YieldNode(expr)
+
+    def import_expr(self):
+        self.advance()
+        if self.current_token.type != TOK_STRING: raise Exception("Expected module path string")
+        path_token = self.current_token
+        self.advance()
+        alias_token = None
+        if self.check_keyword('as'):
+            self.advance()
+            if self.current_token.type != TOK_IDENTIFIER: raise Exception("Expected module name after 'as'")
+            alias_token = self.current_token
+            self.advance()
+        return ImportNode(path_token, alias_token)
+
     def bin_op(self, func, ops):
         left = func()
         while self.current_token.type in ops:
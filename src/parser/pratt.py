@@ -0,0 +1,49 @@
+from lexer.lexer import *
+from parser.nodes import *
+from parser.parser import Parser
+
+# Left binding power of every binary operator; higher binds tighter. All
+# levels are left-associative, matching comp_expr/arith_expr/term.
+BINDING_POWER = {
+    TOK_EE: 10, TOK_NE: 10, TOK_LT: 10, TOK_GT: 10, TOK_LTE: 10, TOK_GTE: 10,
+    TOK_PLUS: 20, TOK_MINUS: 20,
+    TOK_MUL: 30, TOK_DIV: 30,
+}
+
+class PrattParser(Parser):
+    # Drop-in replacement for Parser that parses binary expressions with one
+    # precedence-climbing loop instead of one method per precedence level, and
+    # dispatches statement keywords through a table. Builds the same AST.
+    def __init__(self, tokens):
+        super().__init__(tokens)
+        self.keyword_parsers = {
+            'if': self.if_expr,
+            'while': self.while_expr,
+            'for': self.for_expr,
+            'def': self.func_def,
+            'return': self.return_expr,
+            'import': self.import_expr,
+            'yield': self.yield_expr,
+        }
+
+    def expr(self):
+        token = self.current_token
+        if token.type == TOK_KEYWORD and token.value in ('mem', 'emit'):
+            return super().expr()
+        return self.comp_expr()
+
+    def comp_expr(self):
+        token = self.current_token
+        if token.type == TOK_KEYWORD:
+            keyword_parser = self.keyword_parsers.get(token.value)
+            if keyword_parser: return keyword_parser()
+        return self.binary_expr(0)
+
+    def binary_expr(self, min_power):
+        left = self.factor()
+        while True:
+            op_token = self.current_token
+            power = BINDING_POWER.get(op_token.type)
+            if power is None or power <= min_power: return left
+            self.advance()
+            left = BinOpNode(left, op_token, self.binary_expr(power))